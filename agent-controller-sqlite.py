@@ -13,10 +13,23 @@ Phase 1 (Minimal Viable):
 - GET /agents?updates=true - Return agents with pending updates
 - API key authentication
 
+Requirements:
+    pip install quart uvicorn orjson
+
 Usage:
     chmod +x agent-controller-service
     ./agent-controller-service
 
+The service is an ASGI application (Quart) served by Uvicorn, so concurrent
+gvmd polls are multiplexed on one event loop instead of holding a thread each.
+Blocking SQLite work is pushed to a bounded thread pool (DB_WORKER_THREADS).
+
+Run it as a single worker process: the heartbeat writer, the response and
+authorization caches and the job long-poll waiters are all in-process state.
+Uvicorn uses uvloop and httptools when they are installed
+(pip install 'uvicorn[standard]'). Its access log is off by default since
+every handler already logs its request; set ACCESS_LOG=true to enable it.
+
 Then configure gvmd scanner:
     Scanner Type: agent-controller (type 7)
     Host: localhost
@@ -25,221 +38,1317 @@ Then configure gvmd scanner:
     API Key: test-api-key-12345
 """
 
-from flask import Flask, request, jsonify
-from functools import wraps
-from datetime import datetime
+from quart import Quart, Response, request, current_app
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+import asyncio
+import atexit
+import hashlib
+import hmac
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import sqlite3
-import json
+import threading
+import time
+import orjson
 import uuid
-
-app = Flask(__name__)
-logging.basicConfig(level=logging.INFO)
+import uvicorn
+
+app = Quart(__name__)
+
+# Log records are handed to a queue and written by a listener thread, so
+# request handlers never block on stream I/O. basicConfig installs the
+# formatter on the QueueHandler, so records arrive at the listener pre-formatted.
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
 logger = logging.getLogger(__name__)
 
 # Configuration
 API_KEY = os.environ.get("API_KEY", "test-api-key-12345")  # Change this in production
 AGENT_TOKEN = os.environ.get("AGENT_TOKEN", "test-agent-token-67890")  # Agent authentication token
+# Precomputed forms for constant-time comparison in the auth decorators
+API_KEY_BYTES = API_KEY.encode()
+AGENT_AUTH_HEADER_BYTES = f"Bearer {AGENT_TOKEN}".encode()
 PORT = int(os.environ.get("PORT", 3001))
 HOST = os.environ.get("HOST", "0.0.0.0")
+ACCESS_LOG = os.environ.get("ACCESS_LOG", "").lower() == "true"  # Uvicorn's per-request access log
+DB_WORKER_THREADS = int(os.environ.get("DB_WORKER_THREADS", 64))  # Threads available for blocking SQLite calls
+RESULTS_STREAM_CHUNK = 100  # Scan results serialized per streamed chunk
+HEARTBEAT_BATCH_WINDOW = 0.001  # Seconds the heartbeat writer waits to coalesce a batch
+HEARTBEAT_BATCH_MAX = 500  # Heartbeats committed per batch at most
+HEARTBEAT_WRITE_TIMEOUT = 30  # Seconds a heartbeat waits for the writer before failing
+AGENT_AUTHORIZED_CACHE_TTL = 60  # Seconds a job poll may reuse an agent's authorized flag
+AGENTS_RESPONSE_CACHE_TTL = 2  # Seconds GET /agents may serve a cached body
+LONG_POLL_TIMEOUT = float(os.environ.get("LONG_POLL_TIMEOUT", 30))  # Seconds an empty job poll waits for work; 0 disables
+# Largest accepted request body in bytes; unset means unlimited, as under Flask
+# (Quart would otherwise reject bodies over 16 MiB, e.g. large result submissions)
+MAX_CONTENT_LENGTH = int(os.environ["MAX_CONTENT_LENGTH"]) if os.environ.get("MAX_CONTENT_LENGTH") else None
+app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
 
 # Database configuration
 DB_PATH = '/app/agent_controller.db'
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 8))  # Long-lived SQLite connections kept open
+DB_BUSY_TIMEOUT = float(os.environ.get("DB_BUSY_TIMEOUT", 5.0))  # Seconds to wait for a lock or a free connection
+DB_STATEMENT_CACHE_SIZE = 256  # Prepared statements kept per connection (sqlite3 default is 128)
+
+# Applied once to every pooled connection when it is opened
+DB_CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -64000;
+"""
 
-global_config = None
+# Bump when SCHEMA_SQL changes; init_database skips DDL once a database
+# reports this PRAGMA user_version
+SCHEMA_VERSION = 3
+
+SCHEMA_SQL = """
+-- Create agents table
+CREATE TABLE IF NOT EXISTS agents (
+    agent_id TEXT PRIMARY KEY,
+    hostname TEXT NOT NULL,
+    authorized INTEGER DEFAULT 0,
+    connection_status TEXT DEFAULT 'inactive',
+    last_update INTEGER,
+    last_updater_heartbeat INTEGER,
+    config TEXT,
+    updater_version TEXT DEFAULT '',
+    agent_version TEXT DEFAULT '',
+    operating_system TEXT DEFAULT '',
+    architecture TEXT DEFAULT '',
+    update_to_latest INTEGER DEFAULT 0
+);
+
+-- Create agent_ip_addresses table
+CREATE TABLE IF NOT EXISTS agent_ip_addresses (
+    agent_id TEXT,
+    ip_address TEXT,
+    FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
+);
+
+-- Create scans table per PRD Section 7.1.2
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    progress INTEGER DEFAULT 0,
+    agents_total INTEGER DEFAULT 0,
+    agents_running INTEGER DEFAULT 0,
+    agents_completed INTEGER DEFAULT 0,
+    agents_failed INTEGER DEFAULT 0,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER,
+    vts TEXT NOT NULL,
+    agents TEXT NOT NULL,
+    targets TEXT NOT NULL,
+    scanner_preferences TEXT
+);
+
+-- Create scan_jobs table
+CREATE TABLE IF NOT EXISTS scan_jobs (
+    job_id TEXT PRIMARY KEY,
+    scan_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    job_type TEXT DEFAULT 'vulnerability_scan',
+    priority TEXT DEFAULT 'normal',
+    created_at TEXT NOT NULL,
+    status TEXT DEFAULT 'queued',
+    config TEXT NOT NULL,
+    FOREIGN KEY (scan_id) REFERENCES scans (scan_id),
+    FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
+);
+
+-- Create scan_results table
+CREATE TABLE IF NOT EXISTS scan_results (
+    result_id TEXT PRIMARY KEY,
+    scan_id TEXT NOT NULL,
+    agent_id TEXT,
+    agent_hostname TEXT,
+    nvt_oid TEXT,
+    nvt_name TEXT,
+    nvt_severity REAL,
+    nvt_cvss_base_vector TEXT,
+    host TEXT,
+    port TEXT,
+    threat TEXT,
+    description TEXT,
+    qod INTEGER,
+    FOREIGN KEY (scan_id) REFERENCES scans (scan_id)
+);
+
+-- Index the foreign-key columns used by hot WHERE clauses
+CREATE INDEX IF NOT EXISTS idx_jobs_scan ON scan_jobs (scan_id);
+CREATE INDEX IF NOT EXISTS idx_results_scan ON scan_results (scan_id);
+-- Job polls seek on (agent_id, status) and serve jobs in created_at order;
+-- heartbeats delete individual (agent_id, ip_address) rows. These replace
+-- the single-column agent_id indexes of schema version 1.
+DROP INDEX IF EXISTS idx_jobs_agent;
+DROP INDEX IF EXISTS idx_ip_agent;
+CREATE INDEX IF NOT EXISTS idx_jobs_agent_status_created ON scan_jobs (agent_id, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_ip_agent_address ON agent_ip_addresses (agent_id, ip_address);
+-- Partial index: only agents flagged for an update are ever looked up this way
+CREATE INDEX IF NOT EXISTS idx_agents_updates ON agents (update_to_latest)
+    WHERE update_to_latest = 1;
+
+-- Deleting a scan removes its jobs and results in the same statement.
+-- A trigger is used rather than ON DELETE CASCADE because cascading needs
+-- PRAGMA foreign_keys=ON, which would also start enforcing the agent_id
+-- references (scans may target agents that are not registered yet, and
+-- agents with jobs must stay deletable).
+CREATE TRIGGER IF NOT EXISTS trg_scans_delete_cascade
+AFTER DELETE ON scans
+BEGIN
+    DELETE FROM scan_results WHERE scan_id = OLD.scan_id;
+    DELETE FROM scan_jobs WHERE scan_id = OLD.scan_id;
+END;
+
+-- Likewise, deleting an agent removes its IP addresses
+CREATE TRIGGER IF NOT EXISTS trg_agents_delete_cascade
+AFTER DELETE ON agents
+BEGIN
+    DELETE FROM agent_ip_addresses WHERE agent_id = OLD.agent_id;
+END;
+"""
 
 
 def init_database():
-    """Initialize SQLite database with required tables"""
+    """
+    Initialize SQLite database with required tables.
+
+    The schema is created in one executescript() call and stamped with
+    PRAGMA user_version, so starts against an up-to-date database skip DDL.
+    """
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
 
-    # Create agents table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS agents (
-            agent_id TEXT PRIMARY KEY,
-            hostname TEXT NOT NULL,
-            authorized INTEGER DEFAULT 0,
-            connection_status TEXT DEFAULT 'inactive',
-            last_update INTEGER,
-            last_updater_heartbeat INTEGER,
-            config TEXT,
-            updater_version TEXT DEFAULT '',
-            agent_version TEXT DEFAULT '',
-            operating_system TEXT DEFAULT '',
-            architecture TEXT DEFAULT '',
-            update_to_latest INTEGER DEFAULT 0
-        )
-    """)
-
-    # Create agent_ip_addresses table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS agent_ip_addresses (
-            agent_id TEXT,
-            ip_address TEXT,
-            FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
-        )
-    """)
-
-    # Create scans table per PRD Section 7.1.2
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS scans (
-            scan_id TEXT PRIMARY KEY,
-            status TEXT NOT NULL,
-            progress INTEGER DEFAULT 0,
-            agents_total INTEGER DEFAULT 0,
-            agents_running INTEGER DEFAULT 0,
-            agents_completed INTEGER DEFAULT 0,
-            agents_failed INTEGER DEFAULT 0,
-            start_time INTEGER NOT NULL,
-            end_time INTEGER,
-            vts TEXT NOT NULL,
-            agents TEXT NOT NULL,
-            targets TEXT NOT NULL,
-            scanner_preferences TEXT
-        )
-    """)
-
-    # Create scan_jobs table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS scan_jobs (
-            job_id TEXT PRIMARY KEY,
-            scan_id TEXT NOT NULL,
-            agent_id TEXT NOT NULL,
-            job_type TEXT DEFAULT 'vulnerability_scan',
-            priority TEXT DEFAULT 'normal',
-            created_at TEXT NOT NULL,
-            status TEXT DEFAULT 'queued',
-            config TEXT NOT NULL,
-            FOREIGN KEY (scan_id) REFERENCES scans (scan_id),
-            FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
-        )
-    """)
-
-    # Create scan_results table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS scan_results (
-            result_id TEXT PRIMARY KEY,
-            scan_id TEXT NOT NULL,
-            agent_id TEXT,
-            agent_hostname TEXT,
-            nvt_oid TEXT,
-            nvt_name TEXT,
-            nvt_severity REAL,
-            nvt_cvss_base_vector TEXT,
-            host TEXT,
-            port TEXT,
-            threat TEXT,
-            description TEXT,
-            qod INTEGER,
-            FOREIGN KEY (scan_id) REFERENCES scans (scan_id)
+    # WAL is persistent: switch the database file once here, so even the
+    # first pooled connections never race to change the journal mode
+    cur.execute("PRAGMA journal_mode = WAL")
+
+    if cur.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        # Statements are IF NOT EXISTS, so pre-versioning databases (user_version 0)
+        # are upgraded in place
+        cur.executescript(f"""
+            BEGIN;
+            {SCHEMA_SQL}
+            PRAGMA user_version = {SCHEMA_VERSION};
+            COMMIT;
+        """)
+
+    # Refresh planner statistics so the indexes are used. analysis_limit caps
+    # the rows read per index, so this stays cheap however large
+    # scan_results grows. From SQLite 3.46 optimize can check every table
+    # (0x10000) and only analyzes those with missing or stale statistics;
+    # older versions only consider tables this connection has queried,
+    # which on a fresh connection is none, so they run ANALYZE instead.
+    cur.execute("PRAGMA analysis_limit = 400")
+    if sqlite3.sqlite_version_info >= (3, 46):
+        cur.execute("PRAGMA optimize = 0x10002")
+    else:
+        cur.execute("ANALYZE")
+
+    conn.close()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to `size` and handed back to the pool
+    instead of being closed, so the open/WAL/SHM setup and the page cache of
+    each connection survive across requests. Connections are shared between
+    the executor threads (check_same_thread=False) but only ever used by one
+    thread at a time.
+    """
+
+    def __init__(self, path, size=DB_POOL_SIZE, timeout=DB_BUSY_TIMEOUT):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE
         )
-    """)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(DB_CONNECTION_PRAGMAS)
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, opening a new one while below `size`"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+
+        if can_open:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        # Pool exhausted: wait for a connection to be released (raises queue.Empty on timeout)
+        return self._idle.get(timeout=self.timeout)
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any uncommitted work"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager that borrows a connection for the duration of a block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close all idle connections (called at shutdown)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+db_pool = ConnectionPool(DB_PATH)
 
+
+@contextmanager
+def immediate_transaction(conn):
+    """
+    Run a block inside one BEGIN IMMEDIATE transaction.
+
+    The write lock is taken up front, so concurrent writers queue on the busy
+    timeout instead of failing a SHARED->RESERVED upgrade half-way through.
+    Commits on success, rolls back on any exception.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
     conn.commit()
-    conn.close()
 
 
-def get_db_connection():
-    """Get a connection to the SQLite database"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Renders each agent's scalar fields as a JSON object inside SQLite, so no
+# Python object is built per row or field; get_agents_body_from_db splices
+# in the IP addresses and the stored config column, which is already JSON
+# (NULL or empty falls back to the default config). {where} filters agents.
+SQL_SELECT_AGENTS_JSON = """
+    SELECT agent_id, json_object(
+        'agentid', agent_id,
+        'hostname', hostname,
+        'authorized', json(CASE WHEN authorized THEN 'true' ELSE 'false' END),
+        'connection_status', connection_status,
+        'last_update', last_update,
+        'last_updater_heartbeat', last_updater_heartbeat,
+        'updater_version', COALESCE(updater_version, ''),
+        'agent_version', COALESCE(agent_version, ''),
+        'operating_system', COALESCE(operating_system, ''),
+        'architecture', COALESCE(architecture, ''),
+        'update_to_latest', json(CASE WHEN update_to_latest THEN 'true' ELSE 'false' END)
+    ),
+    -- A stored config that is not a JSON object (legacy rows, manual edits)
+    -- is replaced by the default config rather than spliced raw into the body
+    CASE WHEN json_valid(config) THEN CASE WHEN json_type(config) = 'object' THEN config END END
+    FROM agents
+    {where}
+"""
+SQL_SELECT_ALL_AGENTS_JSON = SQL_SELECT_AGENTS_JSON.format(where="")
+SQL_SELECT_UPDATE_AGENTS_JSON = SQL_SELECT_AGENTS_JSON.format(where="WHERE update_to_latest = 1")
+
+
+# updates_only -> (body, agent count, expires_at). Admin writes and
+# heartbeats that rewrite an agent clear it; the TTL bounds the staleness of
+# timestamps bumped by unchanged heartbeats.
+# A body is only stored if no invalidation happened while it was built.
+# Invalidations come from worker threads and the heartbeat writer, so the
+# generation check and the store hold agents_response_lock.
+agents_response_cache = {}
+agents_response_generation = 0
+agents_response_lock = threading.Lock()
+
+
+def invalidate_agents_response():
+    """Drop cached GET /agents bodies after agents are added, changed or deleted"""
+    global agents_response_generation
+    with agents_response_lock:
+        agents_response_generation += 1
+        agents_response_cache.clear()
+
+
+async def get_agents_response_body(updates_only):
+    """Return (GET /agents body, agent count), from agents_response_cache when fresh"""
+    now = time.monotonic()
+    cached = agents_response_cache.get(updates_only)
+    if cached is not None and cached[2] > now:
+        return cached[0], cached[1]
+
+    generation = agents_response_generation
+    rendered = await asyncio.to_thread(get_agents_body_from_db, updates_only)
+    if rendered is None:
+        # Database error: answer with no agents, as before, but do not cache it
+        return b"[]", 0
+
+    body, count = rendered
+    with agents_response_lock:
+        if generation == agents_response_generation:
+            agents_response_cache[updates_only] = (body, count, time.monotonic() + AGENTS_RESPONSE_CACHE_TTL)
+    return body, count
+
+
+def get_agents_body_from_db(updates_only=False):
+    """
+    Render the GET /agents JSON array straight from the database. Blocking;
+    call via asyncio.to_thread.
+
+    Returns:
+        Tuple of (body, agent count), or None on a database error
+    """
+    try:
+        with db_pool.connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+
+            # Group IP addresses by agent in one pass instead of one query per agent
+            if updates_only:
+                cur.execute("""
+                    SELECT ip.agent_id, ip.ip_address
+                    FROM agent_ip_addresses ip
+                    JOIN agents a ON a.agent_id = ip.agent_id
+                    WHERE a.update_to_latest = 1
+                    ORDER BY ip.rowid
+                """)
+            else:
+                cur.execute("SELECT agent_id, ip_address FROM agent_ip_addresses ORDER BY rowid")
+            ip_addresses_by_agent = defaultdict(list)
+            for agent_id, ip_address in cur:
+                ip_addresses_by_agent[agent_id].append(ip_address)
+
+            cur.execute(SQL_SELECT_UPDATE_AGENTS_JSON if updates_only else SQL_SELECT_ALL_AGENTS_JSON)
+            agents_json = []
+            for agent_id, fields_json, config_json in cur:
+                ip_addresses = ip_addresses_by_agent.get(agent_id, [])
+                agents_json.append(
+                    f'{fields_json[:-1]},"ip_addresses":{orjson.dumps(ip_addresses).decode()},'
+                    f'"ip_address_count":{len(ip_addresses)},"config":{config_json or DEFAULT_SCAN_AGENT_CONFIG_JSON}}}'
+                )
+
+        return f"[{','.join(agents_json)}]".encode(), len(agents_json)
+
+    except Exception as e:
+        logger.error("Database error in get_agents_body_from_db: %s", e)
+        return None
+
+
+# Columns PATCH /agents may update, in bitmask order
+UPDATABLE_AGENT_COLUMNS = ('authorized', 'config')
+
+PATCH_BATCH_SIZE = 512  # Agents merged into one UPDATE statement at most; a power of two
+
+
+def merged_update_slots(count):
+    """Round a batch size up to the power of two its UPDATE statement is built for"""
+    return 1 << (count - 1).bit_length()
+
+
+@lru_cache(maxsize=64)
+def merged_agent_update_sql(mask, count):
+    """
+    Build the UPDATE applying one combination of updatable columns to
+    `count` agents at once.
+
+    mask selects the columns (bit i set = UPDATABLE_AGENT_COLUMNS[i]); each
+    gets a CASE agent_id WHEN ? THEN ? ... arm per agent. RETURNING lists
+    the agents that exist. Returns (sql, columns); memoized so repeated
+    batch shapes reuse the same SQL text and hit the statement cache.
+
+    Callers pass merged_update_slots() sizes and fill unused slots with
+    NULL, which never equals an agent_id, so only a handful of statements
+    per mask are ever prepared.
+    """
+    columns = tuple(column for i, column in enumerate(UPDATABLE_AGENT_COLUMNS) if mask & (1 << i))
+    assignments = ", ".join(
+        f"{column} = CASE agent_id {'WHEN ? THEN ? ' * count}END"
+        for column in columns
+    )
+    sql = f"UPDATE agents SET {assignments} WHERE agent_id IN ({', '.join('?' * count)}) RETURNING agent_id"
+    return sql, columns
+
+
+SQL_DELETE_AGENT = "DELETE FROM agents WHERE agent_id = ?"
+
+
+# The agent_id PRIMARY KEY doubles as the existence check for registration
+SQL_REGISTER_AGENT = """
+    INSERT INTO agents (
+        agent_id, hostname, authorized, connection_status, last_update,
+        last_updater_heartbeat, config, updater_version, agent_version,
+        operating_system, architecture, update_to_latest
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (agent_id) DO NOTHING
+"""
+
+
+def register_agent_in_db(data, timestamp):
+    """
+    Insert a manually registered agent and its IP addresses. Blocking; call
+    via asyncio.to_thread.
+
+    Returns:
+        True, or False if an agent with this ID already exists
+    """
+    with db_pool.connection() as conn:
+        with immediate_transaction(conn):
+            cur = conn.cursor()
+
+            # Insert agent into database
+            cur.execute(SQL_REGISTER_AGENT, (
+                data['agent_id'],
+                data['hostname'],
+                0,  # Not authorized by default
+                'active',
+                timestamp,
+                timestamp,
+                DEFAULT_SCAN_AGENT_CONFIG_JSON,
+                data.get('updater_version', ''),
+                data.get('agent_version', ''),
+                data.get('operating_system', ''),
+                data.get('architecture', ''),
+                0
+            ))
+            if cur.rowcount == 0:
+                return False
+
+            # Insert IP addresses
+            cur.executemany(SQL_INSERT_AGENT_IP, [(data['agent_id'], ip_address) for ip_address in data.get('ip_addresses', [])])
+
+    return True
+
+
+def delete_agents_from_db(agent_ids):
+    """
+    Delete agents per FR-AC-006; trg_agents_delete_cascade removes their IP
+    addresses. Blocking; call via asyncio.to_thread.
+
+    Returns:
+        Number of agents deleted
+    """
+    with db_pool.connection() as conn:
+        with immediate_transaction(conn):
+            cur = conn.cursor()
+            # rowcount sums the agents rows over all parameter sets and
+            # excludes the trigger's deletes
+            cur.executemany(SQL_DELETE_AGENT, [(agent_id,) for agent_id in agent_ids])
+            return cur.rowcount
+
+
+@lru_cache(maxsize=16)
+def authorized_update_sql(count):
+    """UPDATE setting one authorized value for `count` agents; sized like merged_agent_update_sql"""
+    return f"UPDATE agents SET authorized = ? WHERE agent_id IN ({', '.join('?' * count)}) RETURNING agent_id"
 
 
-def get_agents_from_db(updates_only=False):
-    """Fetch agents from the database"""
+def apply_agent_updates(agent_ids, statements):
+    """
+    Run PATCH UPDATE statements in one BEGIN IMMEDIATE transaction, so a bulk
+    PATCH costs one commit instead of one per agent.
+
+    Args:
+        agent_ids: Every agent ID the PATCH touches
+        statements: Iterable of (query, params) whose RETURNING agent_id
+            lists the updated agents
+
+    Returns:
+        List of agent IDs that were not updated: unknown agents, or every
+        agent if the transaction failed
+    """
+    updated = set()
     try:
-        conn = get_db_connection()
+        with db_pool.connection() as conn:
+            with immediate_transaction(conn):
+                cur = conn.cursor()
+                cur.row_factory = None
+                for query, params in statements:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Executing UPDATE query: %s with params: %s", query, params)
+
+                    cur.execute(query, params)
+                    updated.update(agent_id for agent_id, in cur)
+
+    except Exception as e:
+        logger.error("Database error in apply_agent_updates: %s", e)
+        return list(agent_ids)
+
+    finally:
+        invalidate_agent_authorized(agent_ids)
+        invalidate_agents_response()
+
+    failed = [agent_id for agent_id in agent_ids if agent_id not in updated]
+    logger.info("UPDATE affected %d agents", len(updated))
+    return failed
+
+
+def update_agents_in_db(agent_updates):
+    """
+    Apply PATCH /agents updates. Blocking; call via asyncio.to_thread.
+
+    Agents are grouped by which columns they change and each group is
+    written with merged UPDATE statements of up to PATCH_BATCH_SIZE agents.
+
+    Args:
+        agent_updates: Dict of agent_id -> {column: value} for the
+            UPDATABLE_AGENT_COLUMNS to change
+
+    Returns:
+        List of agent IDs that were not updated, see apply_agent_updates
+    """
+    groups = defaultdict(list)
+    for agent_id, updates in agent_updates.items():
+        mask = ('authorized' in updates) | (('config' in updates) << 1)
+        if mask:
+            groups[mask].append(agent_id)
+
+    statements = []
+    for mask, agent_ids in groups.items():
+        for offset in range(0, len(agent_ids), PATCH_BATCH_SIZE):
+            batch = agent_ids[offset:offset + PATCH_BATCH_SIZE]
+            padding = merged_update_slots(len(batch)) - len(batch)
+            query, columns = merged_agent_update_sql(mask, len(batch) + padding)
+
+            params = []
+            for column in columns:
+                for agent_id in batch:
+                    value = agent_updates[agent_id][column]
+                    params += (agent_id, orjson.dumps(value).decode() if column == 'config' else value)
+                params += (None, None) * padding
+            params += batch
+            params += (None,) * padding
+            statements.append((query, params))
+
+    return apply_agent_updates(agent_updates, statements)
+
+
+def set_agents_authorized_in_db(authorized_flags):
+    """
+    Fast path for the usual gvmd PATCH, which only sets authorized. Blocking;
+    call via asyncio.to_thread.
+
+    Agents are split by the flag they get, so each batch is a plain
+    SET authorized = ? ... WHERE agent_id IN (...) without CASE arms.
+
+    Args:
+        authorized_flags: Dict of agent_id -> 1 or 0
+
+    Returns:
+        List of agent IDs that were not updated, see apply_agent_updates
+    """
+    by_flag = defaultdict(list)
+    for agent_id, authorized in authorized_flags.items():
+        by_flag[authorized].append(agent_id)
+
+    statements = []
+    for authorized, agent_ids in by_flag.items():
+        for offset in range(0, len(agent_ids), PATCH_BATCH_SIZE):
+            batch = agent_ids[offset:offset + PATCH_BATCH_SIZE]
+            padding = merged_update_slots(len(batch)) - len(batch)
+            statements.append((authorized_update_sql(len(batch) + padding), [authorized, *batch, *(None,) * padding]))
+
+    return apply_agent_updates(authorized_flags, statements)
+
+
+def create_scan_in_db(scan_id, timestamp, data):
+    """
+    Insert a scan and one queued job per agent. Blocking; call via asyncio.to_thread.
+
+    Returns:
+        List of created job IDs
+    """
+    # vts/targets/scanner_preferences are shared by the scan row and every
+    # job, so serialize each once and splice them into the job config
+    vts_json = orjson.dumps(data["vts"]).decode()
+    targets_json = orjson.dumps(data["targets"]).decode()
+    prefs_json = orjson.dumps(data.get("scanner_preferences", {})).decode()
+    job_config_json = f'{{"vts":{vts_json},"targets":{targets_json},"scanner_preferences":{prefs_json}}}'
+    created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+    # Queue jobs for each agent per FR-AC-001
+    job_ids = [f"job-{uuid.uuid4()}" for _ in data["agents"]]
+    job_rows = [
+        (job_id, scan_id, agent_data["agent_id"], 'vulnerability_scan', 'normal', created_at, 'queued', job_config_json)
+        for job_id, agent_data in zip(job_ids, data["agents"])
+    ]
+
+    with db_pool.connection() as conn:
+        with immediate_transaction(conn):
+            cur = conn.cursor()
+
+            # Create scan record per FR-AC-001
+            cur.execute("""
+                INSERT INTO scans (
+                    scan_id, status, progress, agents_total, agents_running, agents_completed,
+                    agents_failed, start_time, end_time, vts, agents, targets, scanner_preferences
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                scan_id,
+                'queued',
+                0,
+                len(data["agents"]),
+                0,
+                0,
+                0,
+                timestamp,
+                None,
+                vts_json,
+                orjson.dumps(data["agents"]).decode(),
+                targets_json,
+                prefs_json
+            ))
+
+            cur.executemany("""
+                INSERT INTO scan_jobs (
+                    job_id, scan_id, agent_id, job_type, priority, created_at, status, config
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, job_rows)
+
+    return job_ids
+
+
+def get_scan_from_db(scan_id):
+    """Fetch a scan row, or None if it does not exist. Blocking; call via asyncio.to_thread."""
+    with db_pool.connection() as conn:
         cur = conn.cursor()
 
-        if updates_only:
-            cur.execute("SELECT * FROM agents WHERE update_to_latest = 1")
-        else:
-            cur.execute("SELECT * FROM agents")
+        cur.execute("SELECT * FROM scans WHERE scan_id = ?", (scan_id,))
+        return cur.fetchone()
+
+
+def get_scan_results_from_db(scan_id, offset, limit):
+    """
+    Fetch one page of scan results. Blocking; call via asyncio.to_thread.
+
+    Rows are fetched in full so the pooled connection (and its read
+    transaction) is released before the response is streamed to the client.
+
+    Returns:
+        Tuple of (total_results, rows), or None if the scan does not exist
+    """
+    with db_pool.connection() as conn:
+        # Plain tuples: scan_result_to_dict unpacks columns by position, which
+        # is cheaper than sqlite3.Row name lookups for every field of every row
+        cur = conn.cursor()
+        cur.row_factory = None
+
+        # Get paginated results, with the total count computed in the same pass
+        cur.execute("""
+            SELECT result_id, agent_id, agent_hostname, nvt_oid, nvt_name, nvt_severity,
+                   nvt_cvss_base_vector, host, port, threat, description, qod,
+                   COUNT(*) OVER () AS total_count
+            FROM scan_results
+            WHERE scan_id = ?
+            ORDER BY rowid
+            LIMIT ? OFFSET ?
+        """, (scan_id, limit, offset))
 
         rows = cur.fetchall()
+        if rows:
+            total_results = rows[0][-1]
+        else:
+            # Empty page: either the scan does not exist or the page is past
+            # the end, where the window count is unavailable without rows
+            cur.execute("""
+                SELECT EXISTS (SELECT 1 FROM scans WHERE scan_id = ?) AS scan_exists,
+                       (SELECT COUNT(*) FROM scan_results WHERE scan_id = ?) AS count
+            """, (scan_id, scan_id))
+            scan_exists, total_results = cur.fetchone()
+            if not scan_exists:
+                return None
 
-        # Convert to the format expected by the API
-        agents = []
-        for row in rows:
-            # Get IP addresses for this agent
-            cur.execute("SELECT ip_address FROM agent_ip_addresses WHERE agent_id = ?", (row['agent_id'],))
-            ip_rows = cur.fetchall()
-            ip_addresses = [ip_row['ip_address'] for ip_row in ip_rows]
-
-            agent = {
-                "agentid": row['agent_id'],
-                "hostname": row['hostname'],
-                "authorized": bool(row['authorized']),  # Convert integer to boolean
-                "connection_status": row['connection_status'],
-                "ip_addresses": ip_addresses,
-                "ip_address_count": len(ip_addresses),
-                "last_update": row['last_update'],
-                "last_updater_heartbeat": row['last_updater_heartbeat'],
-                "config": json.loads(row['config']) if row['config'] else get_default_scan_agent_config(),
-                "updater_version": row['updater_version'] or '',
-                "agent_version": row['agent_version'] or '',
-                "operating_system": row['operating_system'] or '',
-                "architecture": row['architecture'] or '',
-                "update_to_latest": bool(row['update_to_latest'])
-            }
-            agents.append(agent)
+        return total_results, rows
 
-        cur.close()
-        conn.close()
-        return agents
 
-    except Exception as e:
-        logger.error(f"Database error in get_agents_from_db: {e}")
-        return []
+def scan_result_to_dict(row):
+    """
+    Convert a scan_results row to the result structure of PRD Section 6.1.
+
+    row is a plain tuple in the column order selected by get_scan_results_from_db.
+    """
+    (result_id, agent_id, agent_hostname, nvt_oid, nvt_name, nvt_severity,
+     nvt_cvss_base_vector, host, port, threat, description, qod, _total_count) = row
+    return {
+        "result_id": result_id,
+        "agent_id": agent_id,
+        "agent_hostname": agent_hostname,
+        "nvt": {
+            "oid": nvt_oid,
+            "name": nvt_name,
+            "severity": nvt_severity,
+            "cvss_base_vector": nvt_cvss_base_vector
+        },
+        "host": host,
+        "port": port,
+        "threat": threat,
+        "description": description,
+        "qod": qod
+    }
 
 
-def update_agent_in_db(agent_id, updates):
-    """Update an agent in the database"""
-    try:
-        conn = get_db_connection()
+async def stream_scan_results(rows, total_results):
+    """
+    Yield the GET /scans/{id}/results body incrementally.
+
+    Rows are serialized RESULTS_STREAM_CHUNK at a time as the client reads,
+    instead of building every result dict and one large JSON document first.
+    """
+    yield b'{"results":['
+    for offset in range(0, len(rows), RESULTS_STREAM_CHUNK):
+        chunk = b",".join(orjson.dumps(scan_result_to_dict(row)) for row in rows[offset:offset + RESULTS_STREAM_CHUNK])
+        yield chunk if offset == 0 else b"," + chunk
+    yield f'],"total_results":{total_results},"returned_results":{len(rows)}}}'.encode()
+
+
+def delete_scan_from_db(scan_id):
+    """
+    Delete a scan; trg_scans_delete_cascade removes its jobs and results.
+    Blocking; call via asyncio.to_thread.
+
+    Returns:
+        Number of job and result rows deleted with the scan, or None if the
+        scan does not exist
+    """
+    with db_pool.connection() as conn:
+        with conn:
+            changes_before = conn.total_changes
+            cur = conn.cursor()
+            cur.execute("DELETE FROM scans WHERE scan_id = ?", (scan_id,))
+            if cur.rowcount == 0:
+                return None
+
+            # total_changes also counts the rows removed by the trigger
+            return conn.total_changes - changes_before - 1
+
+
+# Statements run on the agent-facing paths. Kept as module constants so
+# every call passes the identical string and hits sqlite3's statement cache.
+SQL_SELECT_AGENT_AUTHORIZED = "SELECT authorized FROM agents WHERE agent_id = ?"
+SQL_SELECT_AGENT_HOSTNAME = "SELECT hostname FROM agents WHERE agent_id = ?"
+SQL_CLAIM_AGENT_JOBS = """
+    UPDATE scan_jobs SET status = 'assigned'
+    WHERE agent_id = ? AND status = 'queued'
+    RETURNING job_id, scan_id, job_type, priority, created_at, config
+"""
+SQL_SELECT_JOB_AGENT = "SELECT scan_id, agent_id FROM scan_jobs WHERE job_id = ?"
+SQL_SELECT_JOB_STATUS = "SELECT scan_id, status FROM scan_jobs WHERE job_id = ?"
+SQL_UPDATE_JOB_STATUS = "UPDATE scan_jobs SET status = ? WHERE job_id = ?"
+SQL_INSERT_SCAN_RESULT = """
+    INSERT INTO scan_results (
+        result_id, scan_id, agent_id, agent_hostname,
+        nvt_oid, nvt_name, nvt_severity, nvt_cvss_base_vector,
+        host, port, threat, description, qod
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_SCAN_AGENT_RUNNING = """
+    UPDATE scans SET
+        agents_running = agents_running + 1,
+        status = 'running'
+    WHERE scan_id = ?
+"""
+SQL_SCAN_AGENT_COMPLETED = """
+    UPDATE scans SET
+        agents_completed = agents_completed + 1,
+        agents_running = CASE WHEN agents_running > 0 THEN agents_running - 1 ELSE 0 END,
+        status = CASE WHEN agents_completed + 1 >= agents_total THEN 'completed' ELSE status END,
+        end_time = CASE WHEN agents_completed + 1 >= agents_total THEN ? ELSE end_time END,
+        progress = CASE WHEN agents_completed + 1 >= agents_total THEN 100
+                        ELSE (agents_completed + 1) * 100 / agents_total END
+    WHERE scan_id = ?
+"""
+SQL_UPDATE_AGENT_HEARTBEAT = """
+    UPDATE agents SET
+        hostname = ?,
+        connection_status = ?,
+        last_update = ?,
+        last_updater_heartbeat = ?,
+        agent_version = ?,
+        operating_system = ?,
+        architecture = ?
+    WHERE agent_id = ?
+"""
+SQL_TOUCH_AGENT_HEARTBEAT = "UPDATE agents SET last_update = ?, last_updater_heartbeat = ? WHERE agent_id = ?"
+SQL_INSERT_AGENT = """
+    INSERT INTO agents (
+        agent_id, hostname, authorized, connection_status, last_update,
+        last_updater_heartbeat, config, updater_version, agent_version,
+        operating_system, architecture, update_to_latest
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_INSERT_AGENT_IP = "INSERT INTO agent_ip_addresses (agent_id, ip_address) VALUES (?, ?)"
+SQL_DELETE_AGENT_IP = "DELETE FROM agent_ip_addresses WHERE agent_id = ? AND ip_address = ?"
+
+
+# agent_id -> (authorized, expires_at); entries are dropped whenever the
+# admin API changes or deletes an agent, the TTL bounds any other staleness.
+# As with agents_response_cache, a flag is only stored if no invalidation
+# happened while it was read; both sides run in worker threads, so the
+# generation check and the store hold agent_authorized_lock.
+agent_authorized_cache = {}
+agent_authorized_generation = 0
+agent_authorized_lock = threading.Lock()
+
+
+def invalidate_agent_authorized(agent_ids):
+    """Forget cached authorized flags after agents are updated or deleted"""
+    global agent_authorized_generation
+    with agent_authorized_lock:
+        agent_authorized_generation += 1
+        for agent_id in agent_ids:
+            agent_authorized_cache.pop(agent_id, None)
+
+
+def claim_agent_jobs_in_db(agent_id):
+    """
+    Hand an agent its queued jobs per FR-AC-008. Blocking; call via asyncio.to_thread.
+
+    Returns:
+        Tuple of (authorized, job rows), where unauthorized agents get no
+        jobs, or None if the agent does not exist
+    """
+    with db_pool.connection() as conn:
         cur = conn.cursor()
 
-        # Build the SET clause dynamically
-        set_clauses = []
-        params = []
+        # Check if agent exists and is authorized per FR-AC-008
+        now = time.monotonic()
+        cached = agent_authorized_cache.get(agent_id)
+        if cached is not None and cached[1] > now:
+            authorized = cached[0]
+        else:
+            generation = agent_authorized_generation
+            cur.execute(SQL_SELECT_AGENT_AUTHORIZED, (agent_id,))
+            agent_row = cur.fetchone()
 
-        if 'authorized' in updates:
-            set_clauses.append("authorized = ?")
-            params.append(updates['authorized'])
+            if not agent_row:
+                return None
 
-        if 'config' in updates:
-            set_clauses.append("config = ?")
-            params.append(json.dumps(updates['config']))
+            authorized = bool(agent_row["authorized"])
+            with agent_authorized_lock:
+                if generation == agent_authorized_generation:
+                    agent_authorized_cache[agent_id] = (authorized, now + AGENT_AUTHORIZED_CACHE_TTL)
 
-        if set_clauses:
-            params.append(agent_id)
-            query = f"UPDATE agents SET {', '.join(set_clauses)} WHERE agent_id = ?"
-            logger.info(f"Executing UPDATE query: {query} with params: {params}")
-            cur.execute(query, params)
-            conn.commit()
+        if not authorized:
+            return False, []
 
-            affected_rows = cur.rowcount
-            logger.info(f"UPDATE affected {affected_rows} rows for agent_id: {agent_id}")
-            cur.close()
-            conn.close()
-            return affected_rows > 0
+        # Claim queued jobs for this agent per FR-AC-008: marking them
+        # assigned and reading them back is one statement, so two polls
+        # can never both receive the same job (needs SQLite >= 3.35)
+        with immediate_transaction(conn):
+            cur.execute(SQL_CLAIM_AGENT_JOBS, (agent_id,))
 
-        cur.close()
-        conn.close()
-        return False
+            # RETURNING order is unspecified; jobs are served oldest first
+            rows = sorted(cur.fetchall(), key=lambda row: row["created_at"])
 
-    except Exception as e:
-        logger.error(f"Database error in update_agent_in_db: {e}")
-        return False
+    return True, rows
 
 
+def jobs_response_body(rows):
+    """
+    Render the GET /api/v1/agents/jobs body for claimed job rows.
+
+    The stored config column is already JSON, so it is spliced into each job
+    object as-is instead of being parsed and serialized again.
+    """
+    body = bytearray(b'{"jobs":[')
+    for i, row in enumerate(rows):
+        if i:
+            body += b","
+        body += orjson.dumps({
+            "job_id": row["job_id"],
+            "scan_id": row["scan_id"],
+            "job_type": row["job_type"],
+            "priority": row["priority"],
+            "created_at": row["created_at"]
+        })[:-1]
+        body += b',"config":'
+        body += row["config"].encode()
+        body += b"}"
+    body += b"]}"
+    return bytes(body)
+
+
+def finalize_agent_completion(cur, scan_id, end_time):
+    """
+    Count one agent's job as finished towards its scan per FR-AC-009.
+
+    Increments agents_completed and either updates progress or, once all
+    agents are done, marks the scan completed. It is one statement, so
+    concurrent completions cannot both miss the final transition (every SET
+    expression sees the row as it was before the update).
+    """
+    cur.execute(SQL_SCAN_AGENT_COMPLETED, (end_time, scan_id))
+
+
+def store_job_results_in_db(job_id, data):
+    """
+    Store results submitted for a job and advance the job and scan status
+    per FR-AC-009. Blocking; call via asyncio.to_thread.
+
+    Nothing is written if the job belongs to an agent other than
+    data["agent_id"].
+
+    Returns:
+        Tuple of (job's agent_id, number of results stored), or None if the
+        job does not exist
+    """
+    with db_pool.connection() as conn:
+        with immediate_transaction(conn):
+            cur = conn.cursor()
+
+            # Verify job exists per FR-AC-009
+            cur.execute(SQL_SELECT_JOB_AGENT, (job_id,))
+            job_row = cur.fetchone()
+
+            if not job_row:
+                return None
+
+            scan_id = job_row["scan_id"]
+            expected_agent_id = job_row["agent_id"]
+
+            if data["agent_id"] != expected_agent_id:
+                return expected_agent_id, 0
+
+            # Get agent hostname for results
+            cur.execute(SQL_SELECT_AGENT_HOSTNAME, (data["agent_id"],))
+            agent_row = cur.fetchone()
+            agent_hostname = agent_row["hostname"] if agent_row else "unknown"
+
+            # Store results in database per FR-AC-009. Result IDs are opaque, so
+            # they are cut from one os.urandom() block instead of one uuid4() each
+            results = data.get("results", [])
+            random_hex = os.urandom(16 * len(results)).hex()
+            result_rows = []
+            for i, result in enumerate(results):
+                nvt = result.get("nvt", {})
+                result_rows.append((
+                    f"result-{random_hex[32 * i:32 * i + 32]}",
+                    scan_id,
+                    data["agent_id"],
+                    agent_hostname,
+                    nvt.get("oid"),
+                    nvt.get("name"),
+                    nvt.get("severity"),
+                    nvt.get("cvss_base_vector"),
+                    result.get("host"),
+                    result.get("port"),
+                    result.get("threat"),
+                    result.get("description"),
+                    result.get("qod")
+                ))
+            cur.executemany(SQL_INSERT_SCAN_RESULT, result_rows)
+            results_count = len(result_rows)
+
+            # Update job status
+            cur.execute(SQL_UPDATE_JOB_STATUS, (data["status"], job_id))
+
+            # Update scan progress per FR-AC-009
+            if data["status"] == "completed":
+                finalize_agent_completion(cur, scan_id, int(time.time()))
+
+            elif data["status"] == "running":
+                # Increment agents_running counter
+                cur.execute(SQL_SCAN_AGENT_RUNNING, (scan_id,))
+
+    return expected_agent_id, results_count
+
+
+def complete_job_in_db(job_id):
+    """
+    Mark a job completed and count it towards its scan. Blocking; call via
+    asyncio.to_thread.
+
+    Returns:
+        True, or False if the job does not exist
+    """
+    with db_pool.connection() as conn:
+        with immediate_transaction(conn):
+            cur = conn.cursor()
+
+            # Verify job exists
+            cur.execute(SQL_SELECT_JOB_STATUS, (job_id,))
+            job_row = cur.fetchone()
+
+            if not job_row:
+                return False
+
+            # Update job status to completed
+            cur.execute(SQL_UPDATE_JOB_STATUS, ("completed", job_id))
+
+            scan_id = job_row["scan_id"]
+
+            # Update scan counters, completing the scan once all agents are done
+            finalize_agent_completion(cur, scan_id, int(time.time()))
+
+    return True
+
+
+class HeartbeatWriter:
+    """
+    Group-commit writer for agent heartbeats.
+
+    Handlers submit heartbeats and await the returned future; a single
+    background thread collects everything submitted within
+    HEARTBEAT_BATCH_WINDOW and writes it in one BEGIN IMMEDIATE transaction
+    with executemany, so N concurrent heartbeats cost one commit instead of N.
+    Each future resolves to the agent's authorized flag once the batch is
+    committed, or to the batch's exception.
+
+    In steady state most heartbeats repeat the previous one, so the writer
+    remembers what it last stored per agent; an unchanged heartbeat from a
+    known agent only bumps its timestamps instead of rewriting the row and
+    its IP addresses.
+    """
+
+    def __init__(self, window=HEARTBEAT_BATCH_WINDOW, max_batch=HEARTBEAT_BATCH_MAX):
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._fingerprints = {}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="heartbeat-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Flush pending heartbeats and stop the writer thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def forget(self, agent_ids):
+        """Drop remembered heartbeats, e.g. after agents are deleted"""
+        for agent_id in agent_ids:
+            self._fingerprints.pop(agent_id, None)
+
+    @staticmethod
+    def fingerprint(data):
+        """The heartbeat fields written to an existing agent's row"""
+        return (
+            data.get("hostname"),
+            data.get("connection_status", "active"),
+            data.get("agent_version", ""),
+            data.get("operating_system", ""),
+            data.get("architecture", ""),
+            tuple(data.get("ip_addresses", []))
+        )
+
+    def submit(self, agent_id, data, timestamp):
+        """Queue a heartbeat; returns a concurrent.futures.Future"""
+        future = Future()
+        self._queue.put((agent_id, data, timestamp, future))
+        return future
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # Claim each future so a handler cancelled from now on can no
+            # longer cancel it; heartbeats whose handler already went away
+            # (e.g. the client disconnected) are dropped
+            batch = [item for item in batch if item[3].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                self._commit(batch)
+            except Exception:
+                # Never let a delivery problem stop the writer thread, or
+                # every later heartbeat would wait for it in vain
+                logger.exception("Heartbeat writer failed to deliver a batch")
+
+    def _commit(self, batch):
+        """Write a batch and resolve its futures"""
+        try:
+            authorized = self._write(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                self._deliver(batch[0][3], exception=e)
+                return
+            # Retry one by one so a bad heartbeat only fails its own request
+            logger.warning("Heartbeat batch of %d failed (%s), retrying individually", len(batch), e)
+            for item in batch:
+                self._commit([item])
+        else:
+            for agent_id, _, _, future in batch:
+                self._deliver(future, result=authorized[agent_id])
+
+    @staticmethod
+    def _deliver(future, result=None, exception=None):
+        """Resolve a claimed future, ignoring one that was resolved already"""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _write(self, batch):
+        """Write one batch; returns {agent_id: authorized}"""
+        # Only the newest heartbeat per agent matters within a batch
+        latest = {}
+        for agent_id, data, timestamp, _ in batch:
+            latest[agent_id] = (data, timestamp)
+        agent_ids = list(latest)
+
+        with db_pool.connection() as conn:
+            with immediate_transaction(conn):
+                cur = conn.cursor()
+                cur.row_factory = None
+
+                cur.execute(
+                    f"SELECT agent_id, authorized FROM agents WHERE agent_id IN ({', '.join('?' * len(agent_ids))})",
+                    agent_ids
+                )
+                authorized = {agent_id: bool(flag) for agent_id, flag in cur}
+
+                touches = []
+                updates = []
+                inserts = []
+                ip_additions = []
+                ip_removals = []
+                rewritten = []
+                fingerprints = {}
+                for agent_id, (data, timestamp) in latest.items():
+                    fingerprint = fingerprints[agent_id] = self.fingerprint(data)
+
+                    if agent_id in authorized and self._fingerprints.get(agent_id) == fingerprint:
+                        # Unchanged since the last heartbeat: only the timestamps move
+                        touches.append((timestamp, timestamp, agent_id))
+                        continue
+
+                    if agent_id in authorized:
+                        # Update existing agent per FR-AC-007
+                        logger.info("Heartbeat from existing agent %s", agent_id)
+                        updates.append((
+                            data.get("hostname"),
+                            data.get("connection_status", "active"),
+                            timestamp,
+                            timestamp,
+                            data.get("agent_version", ""),
+                            data.get("operating_system", ""),
+                            data.get("architecture", ""),
+                            agent_id
+                        ))
+                    else:
+                        # Auto-register new agent on first heartbeat per FR-AC-007
+                        logger.info("Auto-registering new agent %s on first heartbeat", agent_id)
+                        inserts.append((
+                            agent_id,
+                            data.get("hostname"),
+                            0,  # Not authorized by default - admin must authorize
+                            data.get("connection_status", "active"),
+                            timestamp,
+                            timestamp,
+                            DEFAULT_SCAN_AGENT_CONFIG_JSON,
+                            data.get("updater_version", ""),
+                            data.get("agent_version", ""),
+                            data.get("operating_system", ""),
+                            data.get("architecture", ""),
+                            0
+                        ))
+                        authorized[agent_id] = False
+
+                    rewritten.append((agent_id, data.get("ip_addresses", [])))
+
+                cur.executemany(SQL_TOUCH_AGENT_HEARTBEAT, touches)
+                cur.executemany(SQL_UPDATE_AGENT_HEARTBEAT, updates)
+                cur.executemany(SQL_INSERT_AGENT, inserts)
+
+                # Diff each rewritten agent's IP addresses against the stored
+                # ones so only added and removed addresses touch the table
+                if rewritten:
+                    cur.execute(
+                        f"SELECT agent_id, ip_address FROM agent_ip_addresses WHERE agent_id IN ({', '.join('?' * len(rewritten))})",
+                        [agent_id for agent_id, _ in rewritten]
+                    )
+                    stored_ips = defaultdict(set)
+                    for agent_id, ip_address in cur:
+                        stored_ips[agent_id].add(ip_address)
+
+                    for agent_id, ip_addresses in rewritten:
+                        stored = stored_ips[agent_id]
+                        submitted = dict.fromkeys(ip_addresses)  # Ordered set
+                        ip_removals.extend((agent_id, ip_address) for ip_address in stored if ip_address not in submitted)
+                        ip_additions.extend((agent_id, ip_address) for ip_address in submitted if ip_address not in stored)
+
+                cur.executemany(SQL_DELETE_AGENT_IP, ip_removals)
+                cur.executemany(SQL_INSERT_AGENT_IP, ip_additions)
+
+        # Only remember what was actually committed
+        self._fingerprints.update(fingerprints)
+        if rewritten:
+            invalidate_agents_response()
+        return authorized
+
+
+heartbeat_writer = HeartbeatWriter()
+
+
+@lru_cache(maxsize=1)
 def get_default_scan_agent_config():
     """
     Return default scan agent configuration matching the structure in
     agent_controller.h lines 66-117
+
+    Built once and shared by every caller (it is embedded in each agent
+    without a stored config), so treat it as read-only and copy.deepcopy()
+    it before modifying.
     """
     return {
         "agent_control": {
@@ -264,6 +1373,88 @@ def get_default_scan_agent_config():
     }
 
 
+# Stored for agents auto-registered by heartbeat or registered manually
+DEFAULT_SCAN_AGENT_CONFIG_JSON = orjson.dumps(get_default_scan_agent_config()).decode()
+
+
+def set_global_config(config):
+    """
+    Replace the global scan agent configuration.
+
+    The heartbeat interval is extracted here once rather than on every
+    heartbeat; it is None if the configuration does not have the expected
+    shape, which agent_heartbeat reports as an error. The serialized config
+    and its ETag are cached too, so config polls neither re-serialize nor,
+    when the client already has this version, resend it.
+    """
+    global global_config, global_config_json, global_config_etag, heartbeat_interval
+
+    global_config = config
+    global_config_json = orjson.dumps(config)
+    global_config_etag = hashlib.sha1(global_config_json).hexdigest()
+    try:
+        heartbeat_interval = config.get("heartbeat", {}).get("interval_in_seconds", 600)
+    except AttributeError:
+        heartbeat_interval = None
+
+
+set_global_config(get_default_scan_agent_config())
+
+
+def global_config_response():
+    """Serve the cached global config, or 304 if the client's If-None-Match is current"""
+    if global_config_etag in request.if_none_match:
+        response = Response(b"", status=304)
+    else:
+        response = Response(global_config_json, mimetype="application/json")
+    response.set_etag(global_config_etag)
+    return response
+
+
+# ?range=start-end for GET /scans/{id}/results; the pattern admits no sign,
+# so start >= 0 holds whenever it matches
+RANGE_PATTERN = re.compile(r'([0-9]+)-([0-9]+)')
+DEFAULT_RESULTS_RANGE = '0-99'
+
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+
+
+def is_valid_uuid(value):
+    """Check for a canonical 8-4-4-4-12 hex UUID string per SR-VALID-001"""
+    return isinstance(value, str) and UUID_PATTERN.fullmatch(value) is not None
+
+
+def json_response(obj, status=200):
+    """
+    Serialize obj with orjson into an application/json response.
+
+    Used instead of jsonify: orjson is several times faster than the stdlib
+    encoder and emits UTF-8 directly instead of ASCII-escaping.
+    """
+    return Response(orjson.dumps(obj), status=status, mimetype="application/json")
+
+
+async def get_request_json():
+    """
+    Parse the request body like request.get_json(), but with orjson.
+
+    Returns None unless the request has a JSON mimetype; a malformed body is
+    rejected through request.on_json_loading_failed as before.
+    """
+    if not request.is_json:
+        return None
+
+    try:
+        return orjson.loads(await request.get_data())
+    except orjson.JSONDecodeError as e:
+        return request.on_json_loading_failed(e)
+
+
+def new_request_id():
+    """Generate an opaque request ID for error responses"""
+    return f"req-{os.urandom(8).hex()}"
+
+
 def error_response(code, message, details=None, status_code=400):
     """
     Generate standard error response per PRD Section 8.4
@@ -275,9 +1466,9 @@ def error_response(code, message, details=None, status_code=400):
         status_code: HTTP status code
 
     Returns:
-        Tuple of (response_dict, status_code)
+        JSON Response carrying the error object and status_code
     """
-    request_id = f"req-{uuid.uuid4()}"
+    request_id = new_request_id()
     error_obj = {
         "error": {
             "code": code,
@@ -289,8 +1480,202 @@ def error_response(code, message, details=None, status_code=400):
     if details:
         error_obj["error"]["details"] = details
 
-    logger.warning(f"Error response: {code} - {message} (request_id: {request_id})")
-    return jsonify(error_obj), status_code
+    logger.warning("Error response: %s - %s (request_id: %s)", code, message, request_id)
+    return json_response(error_obj, status_code)
+
+
+class PrerenderedError:
+    """
+    Standard error response (PRD Section 8.4) whose body is rendered once.
+
+    For fixed failures such as missing or invalid credentials only the
+    request_id changes between calls, so it is spliced into the pre-rendered
+    JSON instead of building and serializing the error dict every time.
+    """
+
+    _REQUEST_ID_MARKER = "\x00request_id\x00"
+
+    def __init__(self, code, message, details=None, status_code=400):
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+
+        error_obj = {
+            "error": {
+                "code": code,
+                "message": message,
+                "request_id": self._REQUEST_ID_MARKER
+            }
+        }
+        if details:
+            error_obj["error"]["details"] = details
+
+        self._prefix, self._suffix = orjson.dumps(error_obj).split(orjson.dumps(self._REQUEST_ID_MARKER))
+
+    def response(self):
+        """Build the (response, status_code) tuple with a fresh request_id"""
+        request_id = new_request_id()
+        logger.warning("Error response: %s - %s (request_id: %s)", self.code, self.message, request_id)
+        body = b'%s"%s"%s' % (self._prefix, request_id.encode(), self._suffix)
+        return Response(body, mimetype="application/json"), self.status_code
+
+
+class RequiredFields:
+    """
+    Required-field check for a request body, built once per endpoint.
+
+    The fields are kept as an ordered dict keys view, so a complete body is
+    accepted with one set comparison against data.keys(); the missing
+    fields are only listed, in declaration order, when the check fails.
+    A body that is not a JSON object has none of the fields and gets the
+    prebuilt error listing all of them.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self._keys = dict.fromkeys(fields).keys()
+        self._all_missing_error = PrerenderedError(
+            "INVALID_REQUEST",
+            "Missing required fields",
+            details=[{"field": field, "issue": "Required field is missing"} for field in fields],
+            status_code=400
+        )
+
+    def check(self, data):
+        """Return the standard missing-fields error response, or None if data has every field"""
+        if not isinstance(data, dict):
+            return self._all_missing_error.response()
+        if data.keys() >= self._keys:
+            return None
+
+        return error_response(
+            "INVALID_REQUEST",
+            "Missing required fields",
+            details=[{"field": field, "issue": "Required field is missing"} for field in self.fields if field not in data],
+            status_code=400
+        )
+
+
+# Required body fields per FR-AC-001, FR-AC-007 and FR-AC-009
+SCAN_REQUIRED_FIELDS = RequiredFields("vts", "agents", "targets")
+HEARTBEAT_REQUIRED_FIELDS = RequiredFields("agent_id", "hostname")
+RESULTS_REQUIRED_FIELDS = RequiredFields("job_id", "scan_id", "agent_id", "status", "results")
+REGISTER_REQUIRED_FIELDS = RequiredFields("agent_id", "hostname")
+
+# Optional heartbeat fields stored as-is in nullable TEXT columns
+HEARTBEAT_OPTIONAL_TEXT_FIELDS = ("connection_status", "updater_version", "agent_version", "operating_system", "architecture")
+
+
+def heartbeat_field_errors(data):
+    """
+    Type-check a heartbeat body before it joins a writer batch.
+
+    Heartbeats are committed together, so a value SQLite would reject
+    (a null hostname, a nested object) is caught here and fails only its
+    own request. Returns a list of detail dicts, empty if the body is valid.
+    """
+    details = []
+    if not isinstance(data["hostname"], str):
+        details.append({"field": "hostname", "issue": "Must be a string"})
+    for field in HEARTBEAT_OPTIONAL_TEXT_FIELDS:
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            details.append({"field": field, "issue": "Must be a string"})
+    ip_addresses = data.get("ip_addresses", [])
+    if not isinstance(ip_addresses, list) or not all(isinstance(ip_address, str) for ip_address in ip_addresses):
+        details.append({"field": "ip_addresses", "issue": "Must be a list of strings"})
+    return details
+
+
+MISSING_API_KEY_ERROR = PrerenderedError(
+    "UNAUTHORIZED",
+    "Missing API key",
+    details=[{"field": "X-API-KEY", "issue": "Required header is missing"}],
+    status_code=401
+)
+INVALID_API_KEY_ERROR = PrerenderedError(
+    "UNAUTHORIZED",
+    "Invalid API key",
+    details=[{"field": "X-API-KEY", "issue": "API key is not valid"}],
+    status_code=401
+)
+MISSING_AGENT_TOKEN_ERROR = PrerenderedError(
+    "UNAUTHORIZED",
+    "Missing authentication token",
+    details=[{"field": "Authorization", "issue": "Required header is missing"}],
+    status_code=401
+)
+INVALID_AUTH_FORMAT_ERROR = PrerenderedError(
+    "UNAUTHORIZED",
+    "Invalid authentication format",
+    details=[{"field": "Authorization", "issue": "Must use 'Bearer <token>' format"}],
+    status_code=401
+)
+INVALID_AGENT_TOKEN_ERROR = PrerenderedError(
+    "UNAUTHORIZED",
+    "Invalid authentication token",
+    details=[{"field": "Authorization", "issue": "Token is not valid"}],
+    status_code=401
+)
+MISSING_BODY_ERROR = PrerenderedError("INVALID_REQUEST", "Missing request body", status_code=400)
+MISSING_CONFIG_BODY_ERROR = PrerenderedError("INVALID_REQUEST", "Missing configuration data in request body", status_code=400)
+ENDPOINT_NOT_FOUND_ERROR = PrerenderedError("NOT_FOUND", "Endpoint does not exist", status_code=404)
+DATABASE_ERROR = PrerenderedError("INTERNAL_ERROR", "Database error", status_code=500)
+INTERNAL_SERVER_ERROR = PrerenderedError("INTERNAL_ERROR", "Internal server error", status_code=500)
+INVALID_HEARTBEAT_CONFIG_ERROR = PrerenderedError(
+    "INTERNAL_ERROR",
+    "Invalid heartbeat configuration",
+    details=[{"field": "heartbeat", "issue": "Scan agent config must contain a heartbeat object"}],
+    status_code=500
+)
+MISSING_AGENT_ID_ERROR = PrerenderedError(
+    "INVALID_REQUEST",
+    "Missing agent ID",
+    details=[{"field": "X-Agent-ID", "issue": "Required header is missing"}],
+    status_code=400
+)
+JOB_AGENT_MISMATCH_ERROR = PrerenderedError(
+    "FORBIDDEN",
+    "Agent not authorized for this job",
+    details=[{"field": "agent_id", "issue": "Job belongs to different agent"}],
+    status_code=403
+)
+MISSING_AGENT_IDS_ERROR = PrerenderedError(
+    "INVALID_REQUEST",
+    "Missing required field",
+    details=[{"field": "agent_ids", "issue": "Required field is missing"}],
+    status_code=400
+)
+INVALID_AGENT_IDS_ERROR = PrerenderedError(
+    "INVALID_REQUEST",
+    "Invalid agent_ids format",
+    details=[{"field": "agent_ids", "issue": "Must be an array of agent IDs"}],
+    status_code=400
+)
+NO_SCAN_AGENTS_ERROR = PrerenderedError(
+    "INVALID_REQUEST",
+    "At least one agent is required",
+    details=[{"field": "agents", "issue": "Must be a non-empty array"}],
+    status_code=400
+)
+INVALID_RANGE_FORMAT_ERROR = PrerenderedError(
+    "INVALID_REQUEST",
+    "Invalid range parameter format",
+    details=[{"field": "range", "issue": "Must be in format 'start-end' (e.g., '0-99')"}],
+    status_code=400
+)
+INVALID_RANGE_ERROR = PrerenderedError(
+    "INVALID_REQUEST",
+    "Invalid range parameter",
+    details=[{"field": "range", "issue": "Must be in format 'start-end' where start >= 0 and end >= start"}],
+    status_code=400
+)
+MISSING_SCAN_AGENT_ID_ERROR = PrerenderedError(
+    "INVALID_REQUEST",
+    "Each agent must have an agent_id",
+    details=[{"field": "agents[].agent_id", "issue": "Required field is missing"}],
+    status_code=400
+)
 
 
 def require_api_key(f):
@@ -301,28 +1686,18 @@ def require_api_key(f):
     Per PRD Section 9.1 (SR-AUTH-001): All Admin API endpoints require API key authentication.
     """
     @wraps(f)
-    def decorated_function(*args, **kwargs):
+    async def decorated_function(*args, **kwargs):
         api_key = request.headers.get('X-API-KEY')
 
         if not api_key:
-            logger.warning(f"Missing API key from {request.remote_addr}")
-            return error_response(
-                "UNAUTHORIZED",
-                "Missing API key",
-                details=[{"field": "X-API-KEY", "issue": "Required header is missing"}],
-                status_code=401
-            )
+            logger.warning("Missing API key from %s", request.remote_addr)
+            return MISSING_API_KEY_ERROR.response()
 
-        if api_key != API_KEY:
-            logger.warning(f"Invalid API key from {request.remote_addr}")
-            return error_response(
-                "UNAUTHORIZED",
-                "Invalid API key",
-                details=[{"field": "X-API-KEY", "issue": "API key is not valid"}],
-                status_code=401
-            )
+        if not hmac.compare_digest(api_key.encode(), API_KEY_BYTES):
+            logger.warning("Invalid API key from %s", request.remote_addr)
+            return INVALID_API_KEY_ERROR.response()
 
-        return f(*args, **kwargs)
+        return await current_app.ensure_async(f)(*args, **kwargs)
     return decorated_function
 
 
@@ -334,46 +1709,29 @@ def require_agent_auth(f):
     Per PRD Section 9.1 (SR-AUTH-001): All Agent API endpoints require agent authentication.
     """
     @wraps(f)
-    def decorated_function(*args, **kwargs):
+    async def decorated_function(*args, **kwargs):
         auth_header = request.headers.get('Authorization')
 
         if not auth_header:
-            logger.warning(f"Missing Authorization header from {request.remote_addr}")
-            return error_response(
-                "UNAUTHORIZED",
-                "Missing authentication token",
-                details=[{"field": "Authorization", "issue": "Required header is missing"}],
-                status_code=401
-            )
-
-        # Check for Bearer token format
-        if not auth_header.startswith('Bearer '):
-            return error_response(
-                "UNAUTHORIZED",
-                "Invalid authentication format",
-                details=[{"field": "Authorization", "issue": "Must use 'Bearer <token>' format"}],
-                status_code=401
-            )
-
-        token = auth_header[7:]  # Remove 'Bearer ' prefix
-
-        if token != AGENT_TOKEN:
-            logger.warning(f"Invalid agent token from {request.remote_addr}")
-            return error_response(
-                "UNAUTHORIZED",
-                "Invalid authentication token",
-                details=[{"field": "Authorization", "issue": "Token is not valid"}],
-                status_code=401
-            )
-
-        return f(*args, **kwargs)
+            logger.warning("Missing Authorization header from %s", request.remote_addr)
+            return MISSING_AGENT_TOKEN_ERROR.response()
+
+        # Compare the whole header against 'Bearer <token>' in constant time;
+        # the format is only inspected to pick the error on failure
+        if not hmac.compare_digest(auth_header.encode(), AGENT_AUTH_HEADER_BYTES):
+            if not auth_header.startswith('Bearer '):
+                return INVALID_AUTH_FORMAT_ERROR.response()
+            logger.warning("Invalid agent token from %s", request.remote_addr)
+            return INVALID_AGENT_TOKEN_ERROR.response()
+
+        return await current_app.ensure_async(f)(*args, **kwargs)
     return decorated_function
 
 
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint (no auth required)"""
-    return jsonify({
+    return json_response({
         "status": "ok",
         "service": "agent-controller",
         "version": "0.1.0-mvp"
@@ -386,7 +1744,7 @@ def health():
 # ============================================================================
 
 @app.route('/scans', methods=['POST'])
-def create_scan():
+async def create_scan():
     """
     POST /scans - Create a new vulnerability scan
 
@@ -407,44 +1765,26 @@ def create_scan():
         "agents_assigned": 1
     }
     """
-    data = request.get_json()
+    data = await get_request_json()
     if not data:
-        return error_response("INVALID_REQUEST", "Missing request body", status_code=400)
+        return MISSING_BODY_ERROR.response()
 
     # Validate required fields per FR-AC-001
-    required_fields = ["vts", "agents", "targets"]
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return error_response(
-            "INVALID_REQUEST",
-            "Missing required fields",
-            details=[{"field": field, "issue": "Required field is missing"} for field in missing_fields],
-            status_code=400
-        )
+    missing_fields_error = SCAN_REQUIRED_FIELDS.check(data)
+    if missing_fields_error is not None:
+        return missing_fields_error
 
     # Validate agents exist and are valid UUIDs per FR-AC-001
     if not isinstance(data["agents"], list) or len(data["agents"]) == 0:
-        return error_response(
-            "INVALID_REQUEST",
-            "At least one agent is required",
-            details=[{"field": "agents", "issue": "Must be a non-empty array"}],
-            status_code=400
-        )
+        return NO_SCAN_AGENTS_ERROR.response()
 
     for agent_data in data["agents"]:
         agent_id = agent_data.get("agent_id")
         if not agent_id:
-            return error_response(
-                "INVALID_REQUEST",
-                "Each agent must have an agent_id",
-                details=[{"field": "agents[].agent_id", "issue": "Required field is missing"}],
-                status_code=400
-            )
+            return MISSING_SCAN_AGENT_ID_ERROR.response()
 
         # Validate UUID format per SR-VALID-001
-        try:
-            uuid.UUID(agent_id)
-        except ValueError:
+        if not is_valid_uuid(agent_id):
             return error_response(
                 "VALIDATION_ERROR",
                 "Invalid agent_id format",
@@ -454,79 +1794,27 @@ def create_scan():
 
     # Generate scan_id per FR-AC-001
     scan_id = str(uuid.uuid4())
-    timestamp = int(datetime.utcnow().timestamp())
+    timestamp = int(time.time())
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # Create scan record per FR-AC-001
-        cur.execute("""
-            INSERT INTO scans (
-                scan_id, status, progress, agents_total, agents_running, agents_completed,
-                agents_failed, start_time, end_time, vts, agents, targets, scanner_preferences
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            scan_id,
-            'queued',
-            0,
-            len(data["agents"]),
-            0,
-            0,
-            0,
-            timestamp,
-            None,
-            json.dumps(data["vts"]),
-            json.dumps(data["agents"]),
-            json.dumps(data["targets"]),
-            json.dumps(data.get("scanner_preferences", {}))
-        ))
-
-        # Queue jobs for each agent per FR-AC-001
-        job_ids = []
-        for agent_data in data["agents"]:
-            job_id = f"job-{uuid.uuid4()}"
-            job_config = {
-                "vts": data["vts"],
-                "targets": data["targets"],
-                "scanner_preferences": data.get("scanner_preferences", {})
-            }
-
-            cur.execute("""
-                INSERT INTO scan_jobs (
-                    job_id, scan_id, agent_id, job_type, priority, created_at, status, config
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                job_id,
-                scan_id,
-                agent_data["agent_id"],
-                'vulnerability_scan',
-                'normal',
-                datetime.utcnow().isoformat() + "Z",
-                'queued',
-                json.dumps(job_config)
-            ))
-            job_ids.append(job_id)
+        job_ids = await asyncio.to_thread(create_scan_in_db, scan_id, timestamp, data)
+        notify_job_waiters(agent_data["agent_id"] for agent_data in data["agents"])
 
-        conn.commit()
-        cur.close()
-        conn.close()
+        logger.info("POST /scans - created scan %s with %d jobs for %d agents", scan_id, len(job_ids), len(data['agents']))
 
-        logger.info(f"POST /scans - created scan {scan_id} with {len(job_ids)} jobs for {len(data['agents'])} agents")
-
-        return jsonify({
+        return json_response({
             "scan_id": scan_id,
             "status": "queued",
             "agents_assigned": len(data["agents"])
-        }), 201
+        }, 201)
 
     except Exception as e:
-        logger.error(f"Database error in create_scan: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in create_scan: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/scans/<scan_id>/status', methods=['GET'])
-def get_scan_status(scan_id):
+async def get_scan_status(scan_id):
     """
     GET /scans/{scan_id}/status - Get scan status
 
@@ -546,20 +1834,14 @@ def get_scan_status(scan_id):
     }
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        cur.execute("SELECT * FROM scans WHERE scan_id = ?", (scan_id,))
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
+        row = await asyncio.to_thread(get_scan_from_db, scan_id)
 
         if not row:
             return error_response("NOT_FOUND", f"Scan not found: {scan_id}", status_code=404)
 
-        logger.info(f"GET /scans/{scan_id}/status - returning status: {row['status']}")
+        logger.info("GET /scans/%s/status - returning status: %s", scan_id, row['status'])
 
-        return jsonify({
+        return json_response({
             "scan_id": row["scan_id"],
             "status": row["status"],
             "progress": row["progress"],
@@ -569,15 +1851,15 @@ def get_scan_status(scan_id):
             "agents_failed": row["agents_failed"],
             "start_time": row["start_time"],
             "end_time": row["end_time"]
-        }), 200
+        })
 
     except Exception as e:
-        logger.error(f"Database error in get_scan_status: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in get_scan_status: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/scans/<scan_id>/results', methods=['GET'])
-def get_scan_results(scan_id):
+async def get_scan_results(scan_id):
     """
     GET /scans/{scan_id}/results - Get scan results
 
@@ -592,92 +1874,38 @@ def get_scan_results(scan_id):
         "returned_results": 100
     }
     """
+    # Parse range parameter per FR-AC-003
+    range_param = request.args.get('range')
+    if range_param is None:
+        range_param = DEFAULT_RESULTS_RANGE
+        start, end = 0, 99
+    else:
+        match = RANGE_PATTERN.fullmatch(range_param)
+        if match is None:
+            return INVALID_RANGE_FORMAT_ERROR.response()
+        start, end = int(match[1]), int(match[2])
+        if end < start:
+            return INVALID_RANGE_ERROR.response()
+
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        page = await asyncio.to_thread(get_scan_results_from_db, scan_id, start, end - start + 1)
 
-        # Check if scan exists
-        cur.execute("SELECT scan_id FROM scans WHERE scan_id = ?", (scan_id,))
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
+        if page is None:
             return error_response("NOT_FOUND", f"Scan not found: {scan_id}", status_code=404)
 
-        # Parse range parameter per FR-AC-003
-        range_param = request.args.get('range', '0-99')
-        try:
-            start, end = map(int, range_param.split('-'))
-            if start < 0 or end < start:
-                cur.close()
-                conn.close()
-                return error_response(
-                    "INVALID_REQUEST",
-                    "Invalid range parameter",
-                    details=[{"field": "range", "issue": "Must be in format 'start-end' where start >= 0 and end >= start"}],
-                    status_code=400
-                )
-        except ValueError:
-            cur.close()
-            conn.close()
-            return error_response(
-                "INVALID_REQUEST",
-                "Invalid range parameter format",
-                details=[{"field": "range", "issue": "Must be in format 'start-end' (e.g., '0-99')"}],
-                status_code=400
-            )
-
-        # Get total count
-        cur.execute("SELECT COUNT(*) as count FROM scan_results WHERE scan_id = ?", (scan_id,))
-        total_results = cur.fetchone()["count"]
-
-        # Get paginated results
-        limit = end - start + 1
-        cur.execute("""
-            SELECT * FROM scan_results
-            WHERE scan_id = ?
-            LIMIT ? OFFSET ?
-        """, (scan_id, limit, start))
-
-        rows = cur.fetchall()
-        results = []
-        for row in rows:
-            result = {
-                "result_id": row["result_id"],
-                "agent_id": row["agent_id"],
-                "agent_hostname": row["agent_hostname"],
-                "nvt": {
-                    "oid": row["nvt_oid"],
-                    "name": row["nvt_name"],
-                    "severity": row["nvt_severity"],
-                    "cvss_base_vector": row["nvt_cvss_base_vector"]
-                },
-                "host": row["host"],
-                "port": row["port"],
-                "threat": row["threat"],
-                "description": row["description"],
-                "qod": row["qod"]
-            }
-            results.append(result)
-
-        cur.close()
-        conn.close()
+        total_results, rows = page
+        returned_results = len(rows)
+        logger.info("GET /scans/%s/results?range=%s - returning %d/%d results", scan_id, range_param, returned_results, total_results)
 
-        returned_results = len(results)
-        logger.info(f"GET /scans/{scan_id}/results?range={range_param} - returning {returned_results}/{total_results} results")
-
-        return jsonify({
-            "results": results,
-            "total_results": total_results,
-            "returned_results": returned_results
-        }), 200
+        return Response(stream_scan_results(rows, total_results), mimetype="application/json"), 200
 
     except Exception as e:
-        logger.error(f"Database error in get_scan_results: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in get_scan_results: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/scans/<scan_id>', methods=['DELETE'])
-def delete_scan(scan_id):
+async def delete_scan(scan_id):
     """
     DELETE /scans/{scan_id} - Delete a scan
 
@@ -686,38 +1914,31 @@ def delete_scan(scan_id):
     Response: HTTP 204 No Content
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        dependents_deleted = await asyncio.to_thread(delete_scan_from_db, scan_id)
 
-        # Check if scan exists
-        cur.execute("SELECT scan_id FROM scans WHERE scan_id = ?", (scan_id,))
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
+        if dependents_deleted is None:
             return error_response("NOT_FOUND", f"Scan not found: {scan_id}", status_code=404)
 
-        # Delete scan results
-        cur.execute("DELETE FROM scan_results WHERE scan_id = ?", (scan_id,))
-        results_deleted = cur.rowcount
+        logger.info("DELETE /scans/%s - deleted scan and %d jobs/results", scan_id, dependents_deleted)
 
-        # Delete scan jobs
-        cur.execute("DELETE FROM scan_jobs WHERE scan_id = ?", (scan_id,))
-        jobs_deleted = cur.rowcount
+        return '', 204
 
-        # Delete scan
-        cur.execute("DELETE FROM scans WHERE scan_id = ?", (scan_id,))
+    except Exception as e:
+        logger.error("Database error in delete_scan: %s", e)
+        return DATABASE_ERROR.response()
 
-        conn.commit()
-        cur.close()
-        conn.close()
 
-        logger.info(f"DELETE /scans/{scan_id} - deleted scan and {jobs_deleted} jobs, {results_deleted} results")
+# agent_id -> asyncio.Event of the job polls waiting for that agent's next job.
+# Only touched from the event loop.
+job_waiters = {}
 
-        return '', 204
 
-    except Exception as e:
-        logger.error(f"Database error in delete_scan: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+def notify_job_waiters(agent_ids):
+    """Wake job polls waiting on these agents after new jobs were queued"""
+    for agent_id in agent_ids:
+        event = job_waiters.pop(agent_id, None)
+        if event is not None:
+            event.set()
 
 
 # ============================================================================
@@ -727,7 +1948,7 @@ def delete_scan(scan_id):
 
 @app.route('/api/v1/agents/heartbeat', methods=['POST'])
 @require_agent_auth
-def agent_heartbeat():
+async def agent_heartbeat():
     """
     POST /api/v1/agents/heartbeat - Accept agent heartbeat
 
@@ -752,27 +1973,19 @@ def agent_heartbeat():
         "authorized": true
     }
     """
-    data = request.get_json()
+    data = await get_request_json()
     if not data:
-        return error_response("INVALID_REQUEST", "Missing request body", status_code=400)
+        return MISSING_BODY_ERROR.response()
 
     # Validate required fields per FR-AC-007
-    required_fields = ["agent_id", "hostname"]
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return error_response(
-            "INVALID_REQUEST",
-            "Missing required fields",
-            details=[{"field": field, "issue": "Required field is missing"} for field in missing_fields],
-            status_code=400
-        )
+    missing_fields_error = HEARTBEAT_REQUIRED_FIELDS.check(data)
+    if missing_fields_error is not None:
+        return missing_fields_error
 
     agent_id = data["agent_id"]
 
     # Validate UUID format per SR-VALID-001
-    try:
-        uuid.UUID(agent_id)
-    except ValueError:
+    if not is_valid_uuid(agent_id):
         return error_response(
             "VALIDATION_ERROR",
             "Invalid agent_id format",
@@ -780,111 +1993,50 @@ def agent_heartbeat():
             status_code=422
         )
 
-    timestamp = int(datetime.utcnow().timestamp())
-
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+    field_errors = heartbeat_field_errors(data)
+    if field_errors:
+        return error_response(
+            "VALIDATION_ERROR",
+            "Invalid heartbeat fields",
+            details=field_errors,
+            status_code=422
+        )
 
-        # Check if agent exists
-        cur.execute("SELECT agent_id, authorized, config FROM agents WHERE agent_id = ?", (agent_id,))
-        existing_agent = cur.fetchone()
+    timestamp = int(time.time())
 
+    try:
+        # Committed by the heartbeat writer together with concurrent heartbeats
+        authorized = await asyncio.wait_for(
+            asyncio.wrap_future(heartbeat_writer.submit(agent_id, data, timestamp)),
+            HEARTBEAT_WRITE_TIMEOUT
+        )
         config_updated = False
 
-        if existing_agent:
-            # Update existing agent per FR-AC-007
-            logger.info(f"Heartbeat from existing agent {agent_id}")
+        next_heartbeat_in_seconds = heartbeat_interval
+        if next_heartbeat_in_seconds is None:
+            return INVALID_HEARTBEAT_CONFIG_ERROR.response()
 
-            # Delete old IP addresses
-            cur.execute("DELETE FROM agent_ip_addresses WHERE agent_id = ?", (agent_id,))
+        logger.info("POST /api/v1/agents/heartbeat - accepted heartbeat from %s, authorized=%s", agent_id, authorized)
 
-            # Update agent record
-            cur.execute("""
-                UPDATE agents SET
-                    hostname = ?,
-                    connection_status = ?,
-                    last_update = ?,
-                    last_updater_heartbeat = ?,
-                    agent_version = ?,
-                    operating_system = ?,
-                    architecture = ?
-                WHERE agent_id = ?
-            """, (
-                data.get("hostname"),
-                data.get("connection_status", "active"),
-                timestamp,
-                timestamp,
-                data.get("agent_version", ""),
-                data.get("operating_system", ""),
-                data.get("architecture", ""),
-                agent_id
-            ))
-
-            authorized = bool(existing_agent["authorized"])
-
-        else:
-            # Auto-register new agent on first heartbeat per FR-AC-007
-            logger.info(f"Auto-registering new agent {agent_id} on first heartbeat")
-
-            cur.execute("""
-                INSERT INTO agents (
-                    agent_id, hostname, authorized, connection_status, last_update,
-                    last_updater_heartbeat, config, updater_version, agent_version,
-                    operating_system, architecture, update_to_latest
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                agent_id,
-                data.get("hostname"),
-                0,  # Not authorized by default - admin must authorize
-                data.get("connection_status", "active"),
-                timestamp,
-                timestamp,
-                json.dumps(get_default_scan_agent_config()),
-                data.get("updater_version", ""),
-                data.get("agent_version", ""),
-                data.get("operating_system", ""),
-                data.get("architecture", ""),
-                0
-            ))
-
-            authorized = False
-
-        # Insert new IP addresses
-        for ip_address in data.get("ip_addresses", []):
-            cur.execute(
-                "INSERT INTO agent_ip_addresses (agent_id, ip_address) VALUES (?, ?)",
-                (agent_id, ip_address)
-            )
-
-        conn.commit()
-        cur.close()
-        conn.close()
-
-        # Get heartbeat interval from config
-        global global_config
-        if global_config is None:
-            global_config = get_default_scan_agent_config()
-
-        next_heartbeat_in_seconds = global_config.get("heartbeat", {}).get("interval_in_seconds", 600)
-
-        logger.info(f"POST /api/v1/agents/heartbeat - accepted heartbeat from {agent_id}, authorized={authorized}")
-
-        return jsonify({
+        return json_response({
             "status": "accepted",
             "config_updated": config_updated,
             "next_heartbeat_in_seconds": next_heartbeat_in_seconds,
             "authorized": authorized
-        }), 200
+        })
+
+    except asyncio.TimeoutError:
+        logger.error("Heartbeat writer did not answer within %s seconds for %s", HEARTBEAT_WRITE_TIMEOUT, agent_id)
+        return DATABASE_ERROR.response()
 
     except Exception as e:
-        logger.error(f"Database error in agent_heartbeat: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in agent_heartbeat: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/api/v1/agents/jobs', methods=['GET'])
 @require_agent_auth
-def agent_get_jobs():
+async def agent_get_jobs():
     """
     GET /api/v1/agents/jobs - Poll for scan jobs
 
@@ -915,17 +2067,10 @@ def agent_get_jobs():
     agent_id = request.headers.get('X-Agent-ID')
 
     if not agent_id:
-        return error_response(
-            "INVALID_REQUEST",
-            "Missing agent ID",
-            details=[{"field": "X-Agent-ID", "issue": "Required header is missing"}],
-            status_code=400
-        )
+        return MISSING_AGENT_ID_ERROR.response()
 
     # Validate UUID format per SR-VALID-001
-    try:
-        uuid.UUID(agent_id)
-    except ValueError:
+    if not is_valid_uuid(agent_id):
         return error_response(
             "VALIDATION_ERROR",
             "Invalid agent_id format",
@@ -934,16 +2079,26 @@ def agent_get_jobs():
         )
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # Check if agent exists and is authorized per FR-AC-008
-        cur.execute("SELECT authorized FROM agents WHERE agent_id = ?", (agent_id,))
-        agent_row = cur.fetchone()
+        # Register for a wake-up before looking for jobs, so jobs queued right
+        # after an empty claim still wake this poll
+        event = job_waiters.setdefault(agent_id, asyncio.Event())
+        claimed = await asyncio.to_thread(claim_agent_jobs_in_db, agent_id)
+
+        if claimed is None:
+            # Unknown agent: do not keep an event around for it
+            if job_waiters.get(agent_id) is event:
+                del job_waiters[agent_id]
+        elif claimed == (True, []) and LONG_POLL_TIMEOUT > 0:
+            # Authorized but nothing queued: hold the poll until create_scan
+            # queues a job for this agent (or the timeout passes), then claim again
+            try:
+                await asyncio.wait_for(event.wait(), LONG_POLL_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                claimed = await asyncio.to_thread(claim_agent_jobs_in_db, agent_id)
 
-        if not agent_row:
-            cur.close()
-            conn.close()
+        if claimed is None:
             return error_response(
                 "NOT_FOUND",
                 f"Agent not found: {agent_id}",
@@ -951,55 +2106,24 @@ def agent_get_jobs():
                 status_code=404
             )
 
-        if not agent_row["authorized"]:
+        authorized, rows = claimed
+        if not authorized:
             # Return empty jobs array if not authorized
-            logger.info(f"GET /api/v1/agents/jobs - agent {agent_id} not authorized, returning empty jobs")
-            cur.close()
-            conn.close()
-            return jsonify({"jobs": []}), 200
-
-        # Get queued jobs for this agent per FR-AC-008
-        cur.execute("""
-            SELECT job_id, scan_id, job_type, priority, created_at, status, config
-            FROM scan_jobs
-            WHERE agent_id = ? AND status = 'queued'
-            ORDER BY created_at ASC
-        """, (agent_id,))
-
-        rows = cur.fetchall()
-        jobs = []
-        for row in rows:
-            job = {
-                "job_id": row["job_id"],
-                "scan_id": row["scan_id"],
-                "job_type": row["job_type"],
-                "priority": row["priority"],
-                "created_at": row["created_at"],
-                "config": json.loads(row["config"])
-            }
-            jobs.append(job)
+            logger.info("GET /api/v1/agents/jobs - agent %s not authorized, returning empty jobs", agent_id)
+            return json_response({"jobs": []})
 
-            # Mark job as assigned per FR-AC-008
-            cur.execute("""
-                UPDATE scan_jobs SET status = 'assigned' WHERE job_id = ?
-            """, (row["job_id"],))
-
-        conn.commit()
-        cur.close()
-        conn.close()
+        logger.info("GET /api/v1/agents/jobs - returning %s jobs for agent %s", len(rows), agent_id)
 
-        logger.info(f"GET /api/v1/agents/jobs - returning {len(jobs)} jobs for agent {agent_id}")
-
-        return jsonify({"jobs": jobs}), 200
+        return Response(jobs_response_body(rows), mimetype="application/json")
 
     except Exception as e:
-        logger.error(f"Database error in agent_get_jobs: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in agent_get_jobs: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/api/v1/agents/jobs/<job_id>/results', methods=['POST'])
 @require_agent_auth
-def agent_submit_results(job_id):
+async def agent_submit_results(job_id):
     """
     POST /api/v1/agents/jobs/{job_id}/results - Submit scan results
 
@@ -1036,20 +2160,14 @@ def agent_submit_results(job_id):
         "results_received": 1
     }
     """
-    data = request.get_json()
+    data = await get_request_json()
     if not data:
-        return error_response("INVALID_REQUEST", "Missing request body", status_code=400)
+        return MISSING_BODY_ERROR.response()
 
     # Validate required fields per FR-AC-009
-    required_fields = ["job_id", "scan_id", "agent_id", "status", "results"]
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return error_response(
-            "INVALID_REQUEST",
-            "Missing required fields",
-            details=[{"field": field, "issue": "Required field is missing"} for field in missing_fields],
-            status_code=400
-        )
+    missing_fields_error = RESULTS_REQUIRED_FIELDS.check(data)
+    if missing_fields_error is not None:
+        return missing_fields_error
 
     if data["job_id"] != job_id:
         return error_response(
@@ -1060,131 +2178,30 @@ def agent_submit_results(job_id):
         )
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # Verify job exists per FR-AC-009
-        cur.execute("SELECT scan_id, agent_id FROM scan_jobs WHERE job_id = ?", (job_id,))
-        job_row = cur.fetchone()
+        stored = await asyncio.to_thread(store_job_results_in_db, job_id, data)
 
-        if not job_row:
-            cur.close()
-            conn.close()
+        if stored is None:
             return error_response("NOT_FOUND", f"Job not found: {job_id}", status_code=404)
 
-        scan_id = job_row["scan_id"]
-        expected_agent_id = job_row["agent_id"]
-
+        expected_agent_id, results_count = stored
         if data["agent_id"] != expected_agent_id:
-            cur.close()
-            conn.close()
-            return error_response(
-                "FORBIDDEN",
-                "Agent not authorized for this job",
-                details=[{"field": "agent_id", "issue": f"Job belongs to different agent"}],
-                status_code=403
-            )
-
-        # Get agent hostname for results
-        cur.execute("SELECT hostname FROM agents WHERE agent_id = ?", (data["agent_id"],))
-        agent_row = cur.fetchone()
-        agent_hostname = agent_row["hostname"] if agent_row else "unknown"
-
-        # Store results in database per FR-AC-009
-        results_count = 0
-        for result in data.get("results", []):
-            result_id = f"result-{uuid.uuid4()}"
-            nvt = result.get("nvt", {})
-
-            cur.execute("""
-                INSERT INTO scan_results (
-                    result_id, scan_id, agent_id, agent_hostname,
-                    nvt_oid, nvt_name, nvt_severity, nvt_cvss_base_vector,
-                    host, port, threat, description, qod
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                result_id,
-                scan_id,
-                data["agent_id"],
-                agent_hostname,
-                nvt.get("oid"),
-                nvt.get("name"),
-                nvt.get("severity"),
-                nvt.get("cvss_base_vector"),
-                result.get("host"),
-                result.get("port"),
-                result.get("threat"),
-                result.get("description"),
-                result.get("qod")
-            ))
-            results_count += 1
-
-        # Update job status
-        cur.execute("""
-            UPDATE scan_jobs SET status = ? WHERE job_id = ?
-        """, (data["status"], job_id))
+            return JOB_AGENT_MISMATCH_ERROR.response()
 
-        # Update scan progress per FR-AC-009
-        if data["status"] == "completed":
-            # Increment agents_completed counter
-            cur.execute("""
-                UPDATE scans SET
-                    agents_completed = agents_completed + 1,
-                    agents_running = CASE WHEN agents_running > 0 THEN agents_running - 1 ELSE 0 END
-                WHERE scan_id = ?
-            """, (scan_id,))
+        logger.info("POST /api/v1/agents/jobs/%s/results - accepted %s results from agent %s", job_id, results_count, data['agent_id'])
 
-            # Update scan status if all agents completed
-            cur.execute("""
-                SELECT agents_total, agents_completed
-                FROM scans
-                WHERE scan_id = ?
-            """, (scan_id,))
-            scan_row = cur.fetchone()
-
-            if scan_row and scan_row["agents_completed"] >= scan_row["agents_total"]:
-                # All agents completed, mark scan as completed
-                end_time = int(datetime.utcnow().timestamp())
-                cur.execute("""
-                    UPDATE scans SET status = 'completed', end_time = ?, progress = 100
-                    WHERE scan_id = ?
-                """, (end_time, scan_id))
-            else:
-                # Calculate progress percentage
-                if scan_row:
-                    progress = int((scan_row["agents_completed"] / scan_row["agents_total"]) * 100)
-                    cur.execute("""
-                        UPDATE scans SET progress = ? WHERE scan_id = ?
-                    """, (progress, scan_id))
-
-        elif data["status"] == "running":
-            # Increment agents_running counter
-            cur.execute("""
-                UPDATE scans SET
-                    agents_running = agents_running + 1,
-                    status = 'running'
-                WHERE scan_id = ?
-            """, (scan_id,))
-
-        conn.commit()
-        cur.close()
-        conn.close()
-
-        logger.info(f"POST /api/v1/agents/jobs/{job_id}/results - accepted {results_count} results from agent {data['agent_id']}")
-
-        return jsonify({
+        return json_response({
             "status": "accepted",
             "results_received": results_count
-        }), 202
+        }, 202)
 
     except Exception as e:
-        logger.error(f"Database error in agent_submit_results: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in agent_submit_results: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/api/v1/agents/jobs/<job_id>/complete', methods=['POST'])
 @require_agent_auth
-def agent_complete_job(job_id):
+async def agent_complete_job(job_id):
     """
     POST /api/v1/agents/jobs/{job_id}/complete - Mark job as complete
 
@@ -1196,64 +2213,21 @@ def agent_complete_job(job_id):
     }
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # Verify job exists
-        cur.execute("SELECT scan_id, status FROM scan_jobs WHERE job_id = ?", (job_id,))
-        job_row = cur.fetchone()
-
-        if not job_row:
-            cur.close()
-            conn.close()
+        if not await asyncio.to_thread(complete_job_in_db, job_id):
             return error_response("NOT_FOUND", f"Job not found: {job_id}", status_code=404)
 
-        # Update job status to completed
-        cur.execute("""
-            UPDATE scan_jobs SET status = 'completed' WHERE job_id = ?
-        """, (job_id,))
-
-        scan_id = job_row["scan_id"]
-
-        # Update scan counters
-        cur.execute("""
-            UPDATE scans SET
-                agents_completed = agents_completed + 1,
-                agents_running = CASE WHEN agents_running > 0 THEN agents_running - 1 ELSE 0 END
-            WHERE scan_id = ?
-        """, (scan_id,))
-
-        # Check if all agents completed
-        cur.execute("""
-            SELECT agents_total, agents_completed
-            FROM scans
-            WHERE scan_id = ?
-        """, (scan_id,))
-        scan_row = cur.fetchone()
-
-        if scan_row and scan_row["agents_completed"] >= scan_row["agents_total"]:
-            end_time = int(datetime.utcnow().timestamp())
-            cur.execute("""
-                UPDATE scans SET status = 'completed', end_time = ?, progress = 100
-                WHERE scan_id = ?
-            """, (end_time, scan_id))
-
-        conn.commit()
-        cur.close()
-        conn.close()
+        logger.info("POST /api/v1/agents/jobs/%s/complete - marked job as completed", job_id)
 
-        logger.info(f"POST /api/v1/agents/jobs/{job_id}/complete - marked job as completed")
-
-        return jsonify({"status": "completed"}), 200
+        return json_response({"status": "completed"})
 
     except Exception as e:
-        logger.error(f"Database error in agent_complete_job: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in agent_complete_job: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/api/v1/agents/config', methods=['GET'])
 @require_agent_auth
-def agent_get_config():
+async def agent_get_config():
     """
     GET /api/v1/agents/config - Get agent configuration
 
@@ -1277,13 +2251,8 @@ def agent_get_config():
         }
     }
     """
-    global global_config
-
-    if global_config is None:
-        global_config = get_default_scan_agent_config()
-
     logger.info("GET /api/v1/agents/config - returning agent configuration")
-    return jsonify(global_config), 200
+    return global_config_response()
 
 
 # ============================================================================
@@ -1294,7 +2263,7 @@ def agent_get_config():
 @app.route('/agents', methods=['GET'])
 @app.route('/api/v1/admin/agents', methods=['GET'])
 @require_api_key
-def get_agents():
+async def get_agents():
     """
     GET /agents - Return list of agents
     GET /api/v1/admin/agents - Return list of agents (actual gvmd path)
@@ -1308,21 +2277,39 @@ def get_agents():
     """
     updates_only = request.args.get('updates', '').lower() == 'true'
 
-    agents = get_agents_from_db(updates_only)
+    body, agent_count = await get_agents_response_body(updates_only)
 
-    logger.info(f"GET {request.path} - returning {len(agents)} agents from database")
-    logger.info(f"DEBUG GET: Headers from GVMD: {dict(request.headers)}")
-    response = jsonify(agents)
-    logger.info(f"DEBUG GET: Status to GVMD: {response.status}")
+    logger.info("GET %s - returning %s agents from database", request.path, agent_count)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("GET: Headers from GVMD: %s", dict(request.headers))
+    response = Response(body, mimetype="application/json")
+    logger.debug("GET: Status to GVMD: %s", response.status)
     return response
 
     
 
 
+# Key set of the PATCH /agents entries served by set_agents_authorized_in_db
+AUTHORIZED_ONLY_UPDATE = {"authorized"}
+
+
+def patch_agents_response(data, failed):
+    """Build the PATCH /agents response: 200, or 207 listing the agents not updated"""
+    errors = [{"agent_id": agent_id, "error": "Agent not found or update failed"} for agent_id in failed]
+
+    logger.info("PATCH /agents - updated %s agents, %s errors", len(data) - len(errors), len(errors))
+    if errors:
+        logger.debug("PATCH: Returning 207 with errors: %s", errors)
+
+        return json_response({"success": False, "errors": errors}, 207)
+    logger.debug("PATCH: Returning 200 success")
+    return json_response({"success": True, "errors": []})
+
+
 @app.route('/agents', methods=['PATCH'])
 @app.route('/api/v1/admin/agents', methods=['PATCH'])
 @require_api_key
-def update_agents():
+async def update_agents():
     """
     PATCH /agents - Update multiple agents (bulk operation)
     PATCH /api/v1/admin/agents - Update multiple agents (bulk operation)
@@ -1345,13 +2332,20 @@ def update_agents():
         "errors": []
     }
     """
-    data = request.get_json()
-    logger.info(f"PATCH /agents - received data: {data}")
-    logger.info(f"DEBUG PATCH: Headers from GVMD: {dict(request.headers)}")
+    data = await get_request_json()
+    logger.info("PATCH /agents - received data: %s", data)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("PATCH: Headers from GVMD: %s", dict(request.headers))
     # Handle the actual format GVMD sends: {"agent-001": {"authorized": True}, ...}
     if isinstance(data, dict):
-        logger.info(f"PATCH /agents - handling GVMD format with {len(data)} agents")
-        errors = []
+        logger.info("PATCH /agents - handling GVMD format with %s agents", len(data))
+        if all(type(update_data) is dict and update_data.keys() == AUTHORIZED_ONLY_UPDATE for update_data in data.values()):
+            # Fast path: gvmd usually only (de)authorizes agents
+            authorized_flags = {agent_id: 1 if update_data["authorized"] else 0 for agent_id, update_data in data.items()}
+            failed = await asyncio.to_thread(set_agents_authorized_in_db, authorized_flags) if authorized_flags else []
+            return patch_agents_response(data, failed)
+
+        agent_updates = {}
         for agent_id, update_data in data.items():
             # Prepare updates for database
             db_updates = {}
@@ -1362,21 +2356,15 @@ def update_agents():
             if "config" in update_data:
                 db_updates["config"] = update_data["config"]
 
-            # Update in database
+            # Agents without updatable fields are left alone
             if db_updates:
-                success = update_agent_in_db(agent_id, db_updates)
-                if not success:
-                    errors.append({"agent_id": agent_id, "error": "Agent not found or update failed"})
-
-        logger.info(f"PATCH /agents - updated {len(data) - len(errors)} agents, {len(errors)} errors")
-        if errors:
-            logger.info(f"DEBUG PATCH: Returning 207 with errors: {errors}")
+                agent_updates[agent_id] = db_updates
 
-            return jsonify({"success": False, "errors": errors}), 207
-        logger.info(f"DEBUG PATCH: Returning 200 success")
-        return jsonify({"success": True, "errors": []})
+        # Update in database
+        failed = await asyncio.to_thread(update_agents_in_db, agent_updates) if agent_updates else []
+        return patch_agents_response(data, failed)
     else:
-        logger.error(f"PATCH /agents - Unexpected data format: {type(data)}")
+        logger.error("PATCH /agents - Unexpected data format: %s", type(data))
         return error_response(
             "INVALID_REQUEST",
             "Invalid request format",
@@ -1387,7 +2375,7 @@ def update_agents():
 
 @app.route('/api/v1/admin/agents/delete', methods=['POST'])
 @require_api_key
-def delete_agents():
+async def delete_agents():
     """
     POST /api/v1/admin/agents/delete - Delete multiple agents
 
@@ -1408,58 +2396,42 @@ def delete_agents():
         "failed": 0
     }
     """
-    data = request.get_json()
+    data = await get_request_json()
     if not data:
-        return error_response("INVALID_REQUEST", "Missing request body", status_code=400)
+        return MISSING_BODY_ERROR.response()
 
-    if 'agent_ids' not in data:
-        return error_response(
-            "INVALID_REQUEST",
-            "Missing required field",
-            details=[{"field": "agent_ids", "issue": "Required field is missing"}],
-            status_code=400
-        )
+    if not isinstance(data, dict) or 'agent_ids' not in data:
+        return MISSING_AGENT_IDS_ERROR.response()
 
+    # Agent IDs are bound straight into the DELETE, so anything but a list of
+    # strings is rejected up front instead of failing inside the transaction
     agent_ids = data['agent_ids']
-    if not isinstance(agent_ids, list):
-        return error_response(
-            "INVALID_REQUEST",
-            "Invalid agent_ids format",
-            details=[{"field": "agent_ids", "issue": "Must be an array of agent IDs"}],
-            status_code=400
-        )
+    if type(agent_ids) is not list or not all(type(agent_id) is str for agent_id in agent_ids):
+        return INVALID_AGENT_IDS_ERROR.response()
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        deleted_count = 0
-        for agent_id in agent_ids:
-            # Delete IP addresses first
-            cur.execute("DELETE FROM agent_ip_addresses WHERE agent_id = ?", (agent_id,))
-            # Delete agent
-            cur.execute("DELETE FROM agents WHERE agent_id = ?", (agent_id,))
-            if cur.rowcount > 0:
-                deleted_count += 1
+        deleted_count = await asyncio.to_thread(delete_agents_from_db, agent_ids)
 
-        conn.commit()
-        cur.close()
-        conn.close()
+        # A re-registered agent must get its first heartbeat written in full
+        # and must not be served jobs on a stale authorization
+        heartbeat_writer.forget(agent_ids)
+        invalidate_agent_authorized(agent_ids)
+        invalidate_agents_response()
 
         failed_count = len(agent_ids) - deleted_count
-        logger.info(f"POST /api/v1/admin/agents/delete - deleted {deleted_count} agents, {failed_count} not found")
+        logger.info("POST /api/v1/admin/agents/delete - deleted %s agents, %s not found", deleted_count, failed_count)
 
-        return jsonify({"deleted": deleted_count, "failed": failed_count}), 200
+        return json_response({"deleted": deleted_count, "failed": failed_count})
 
     except Exception as e:
-        logger.error(f"Database error in delete_agents: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in delete_agents: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.route('/config', methods=['GET'])
 @app.route('/api/v1/admin/config', methods=['GET'])
 @require_api_key
-def get_config():
+async def get_config():
     """
     GET /config - Return global scan agent configuration
 
@@ -1467,19 +2439,14 @@ def get_config():
 
     Response structure matches agent_controller_scan_agent_config (lines 112-117)
     """
-    global global_config
-
-    if global_config is None:
-        global_config = get_default_scan_agent_config()
-
     logger.info("GET /config - returning scan agent configuration")
-    return jsonify(global_config)
+    return global_config_response()
 
 
 @app.route('/config', methods=['PUT', 'PATCH'])
 @app.route('/api/v1/admin/config', methods=['PUT', 'PATCH'])
 @require_api_key
-def update_config():
+async def update_config():
     """
     PUT/PATCH /config - Update global scan agent configuration
 
@@ -1487,22 +2454,20 @@ def update_config():
 
     Request body: Same structure as GET /config response
     """
-    global global_config
-
-    data = request.get_json()
+    data = await get_request_json()
     if not data:
-        return error_response("INVALID_REQUEST", "Missing configuration data in request body", status_code=400)
+        return MISSING_CONFIG_BODY_ERROR.response()
 
-    global_config = data
+    set_global_config(data)
     logger.info("PUT /config - updated scan agent configuration")
 
-    return jsonify({"success": True, "errors": []})
+    return json_response({"success": True, "errors": []})
 
 
 @app.route('/installers', methods=['GET'])
 @app.route('/api/v1/admin/installers', methods=['GET'])
 @require_api_key
-def get_installers():
+async def get_installers():
     """
     GET /installers - Return list of available agent installers
 
@@ -1525,12 +2490,12 @@ def get_installers():
     }
     """
     logger.info("GET /installers - returning empty list (Phase 1)")
-    return jsonify([])
+    return json_response([])
 
 
 @app.route('/agents/register', methods=['POST'])
 @require_api_key
-def register_agent():
+async def register_agent():
     """
     POST /agents/register - Manually register a new agent
 
@@ -1545,73 +2510,28 @@ def register_agent():
         "architecture": "amd64"
     }
     """
-    data = request.get_json()
+    data = await get_request_json()
     if not data:
-        return error_response("INVALID_REQUEST", "Missing request body", status_code=400)
+        return MISSING_BODY_ERROR.response()
 
     # Check required fields
-    missing_fields = []
-    if 'agent_id' not in data:
-        missing_fields.append({"field": "agent_id", "issue": "Required field is missing"})
-    if 'hostname' not in data:
-        missing_fields.append({"field": "hostname", "issue": "Required field is missing"})
+    missing_fields_error = REGISTER_REQUIRED_FIELDS.check(data)
+    if missing_fields_error is not None:
+        return missing_fields_error
 
-    if missing_fields:
-        return error_response(
-            "INVALID_REQUEST",
-            "Missing required fields",
-            details=missing_fields,
-            status_code=400
-        )
-
-    # Check if agent already exists in database
-    existing_agents = get_agents_from_db()
-    if any(a['agentid'] == data['agent_id'] for a in existing_agents):
-        return error_response(
-            "CONFLICT",
-            f"Agent already exists with ID: {data['agent_id']}",
-            details=[{"field": "agent_id", "issue": "An agent with this ID is already registered"}],
-            status_code=409
-        )
+    timestamp = int(time.time())
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # Insert agent into database
-        cur.execute("""
-            INSERT INTO agents (
-                agent_id, hostname, authorized, connection_status, last_update,
-                last_updater_heartbeat, config, updater_version, agent_version,
-                operating_system, architecture, update_to_latest
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data['agent_id'],
-            data['hostname'],
-            0,  # Not authorized by default
-            'active',
-            int(datetime.utcnow().timestamp()),
-            int(datetime.utcnow().timestamp()),
-            json.dumps(get_default_scan_agent_config()),
-            data.get('updater_version', ''),
-            data.get('agent_version', ''),
-            data.get('operating_system', ''),
-            data.get('architecture', ''),
-            0
-        ))
-
-        # Insert IP addresses
-        for ip_address in data.get('ip_addresses', []):
-            cur.execute(
-                "INSERT INTO agent_ip_addresses (agent_id, ip_address) VALUES (?, ?)",
-                (data['agent_id'], ip_address)
+        if not await asyncio.to_thread(register_agent_in_db, data, timestamp):
+            return error_response(
+                "CONFLICT",
+                f"Agent already exists with ID: {data['agent_id']}",
+                details=[{"field": "agent_id", "issue": "An agent with this ID is already registered"}],
+                status_code=409
             )
+        invalidate_agents_response()
 
-        conn.commit()
-        cur.close()
-        conn.close()
-
-        logger.info(f"POST /agents/register - registered agent {data['agent_id']} in database")
+        logger.info("POST /agents/register - registered agent %s in database", data['agent_id'])
 
         # Return the created agent structure
         new_agent = {
@@ -1621,8 +2541,8 @@ def register_agent():
             "connection_status": "active",
             "ip_addresses": data.get('ip_addresses', []),
             "ip_address_count": len(data.get('ip_addresses', [])),
-            "last_update": int(datetime.utcnow().timestamp()),
-            "last_updater_heartbeat": int(datetime.utcnow().timestamp()),
+            "last_update": timestamp,
+            "last_updater_heartbeat": timestamp,
             "config": get_default_scan_agent_config(),
             "updater_version": data.get('updater_version', ""),
             "agent_version": data.get('agent_version', ""),
@@ -1631,24 +2551,43 @@ def register_agent():
             "update_to_latest": False
         }
 
-        return jsonify({"success": True, "agent": new_agent}), 201
+        return json_response({"success": True, "agent": new_agent}, 201)
 
     except Exception as e:
-        logger.error(f"Database error in register_agent: {e}")
-        return error_response("INTERNAL_ERROR", "Database error", status_code=500)
+        logger.error("Database error in register_agent: %s", e)
+        return DATABASE_ERROR.response()
 
 
 @app.errorhandler(404)
-def not_found(error):
+async def not_found(error):
     """Handle 404 errors with standard error format per PRD Section 8.4"""
-    return error_response("NOT_FOUND", "Endpoint does not exist", status_code=404)
+    return ENDPOINT_NOT_FOUND_ERROR.response()
 
 
 @app.errorhandler(500)
-def internal_error(error):
+async def internal_error(error):
     """Handle 500 errors with standard error format per PRD Section 8.4"""
-    logger.error(f"Internal error: {error}")
-    return error_response("INTERNAL_ERROR", "Internal server error", status_code=500)
+    logger.error("Internal error: %s", error)
+    return INTERNAL_SERVER_ERROR.response()
+
+
+@app.before_serving
+async def configure_db_executor():
+    """
+    Size the default executor used by asyncio.to_thread for blocking SQLite
+    calls and start the heartbeat writer
+    """
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=DB_WORKER_THREADS, thread_name_prefix="db")
+    )
+    heartbeat_writer.start()
+
+
+@app.after_serving
+async def close_db_pool():
+    """Flush pending heartbeats and close pooled SQLite connections on shutdown"""
+    await asyncio.to_thread(heartbeat_writer.stop)
+    db_pool.close()
 
 
 if __name__ == '__main__':
@@ -1658,10 +2597,10 @@ if __name__ == '__main__':
     logger.info("=" * 60)
     logger.info("Agent Controller Service (Minimal Viable - Phase 1 - SQLite)")
     logger.info("=" * 60)
-    logger.info(f"Starting server on {HOST}:{PORT}")
-    logger.info(f"API Key: {API_KEY}")
-    logger.info(f"Agent Token: {AGENT_TOKEN}")
-    logger.info(f"Database: {DB_PATH}")
+    logger.info("Starting server on %s:%s", HOST, PORT)
+    logger.info("API Key: %s", API_KEY)
+    logger.info("Agent Token: %s", AGENT_TOKEN)
+    logger.info("Database: %s", DB_PATH)
     logger.info("")
     logger.info("Scanner API (for gvmd):")
     logger.info("  POST   /scans                - Create scan (FR-AC-001)")
@@ -1690,13 +2629,13 @@ if __name__ == '__main__':
     logger.info("")
     logger.info("Configure gvmd scanner:")
     logger.info("  Type: agent-controller (7)")
-    logger.info(f"  Host: localhost")
-    logger.info(f"  Port: {PORT}")
+    logger.info("  Host: localhost")
+    logger.info("  Port: %s", PORT)
     logger.info("  Protocol: http")
-    logger.info(f"  API Key: {API_KEY}")
+    logger.info("  API Key: %s", API_KEY)
     logger.info("")
     logger.info("Per PRD Section 8.4: All errors use standard format with error codes")
     logger.info("Per CLAUDE.md: NO PLACEHOLDER DATA, NO FALLBACK BEHAVIOR")
     logger.info("=" * 60)
 
-    app.run(host=HOST, port=PORT, debug=True)
+    uvicorn.run(app, host=HOST, port=PORT, workers=1, access_log=ACCESS_LOG)